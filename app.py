@@ -1,12 +1,28 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import time
 import random
 import json
 import math
+import os
+import tempfile
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, date, timedelta
 
+from parallel_agg import NUMERIC_COLUMNS, ParallelAggregator
+from result_cache import ResultCache
+from profiling import file_sha256, profile_csv
+from expressions import CompiledExpression, ExpressionError
+from rollups import GRANULARITIES, TimeRollup, aggregation_label, default_granularity
+from audio import AudioFormatError, audio_summary
+from inference import FEATURES, InferenceService, MockModel
+from session_memory import SessionMemoryRegistry, enforce_quota, preview
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
 # ─────────────────────────────────────────────
 # PAGE CONFIG (must be first st. call)
 # ─────────────────────────────────────────────
@@ -79,10 +95,39 @@ if "form_submitted" not in st.session_state:
 if "theme" not in st.session_state:
     st.session_state.theme = "Dark"
 
+# ─────────────────────────────────────────────
+# SESSION MEMORY ACCOUNTING
+# ─────────────────────────────────────────────
+SESSION_QUOTA_MB = float(os.environ.get("MEGADASH_SESSION_QUOTA_MB", 32))
+CHAT_HISTORY_KEEP = 100
+TODO_KEEP = 200
+SESSION_COMPACTORS = {
+    # Keep the greeting plus the most recent turns.
+    "messages": lambda msgs: msgs[:1] + msgs[1:][-CHAT_HISTORY_KEEP:],
+    "todo_list": lambda todos: todos[-TODO_KEEP:],
+}
+PROTECTED_KEYS = {"counter", "theme", "form_submitted", "computed_expr"}
+
+@st.cache_resource
+def get_memory_registry():
+    return SessionMemoryRegistry()
+
+memory_registry = get_memory_registry()
+ctx = get_script_run_ctx()
+session_id = ctx.session_id if ctx else "local"
+session_sizes = memory_registry.account(session_id, list(st.session_state.items()))
+if sum(session_sizes.values()) > SESSION_QUOTA_MB * 1024**2:
+    session_sizes, quota_actions = enforce_quota(
+        st.session_state, session_sizes, SESSION_QUOTA_MB * 1024**2, SESSION_COMPACTORS, PROTECTED_KEYS,
+    )
+    session_sizes = memory_registry.account(session_id, list(st.session_state.items()))
+    for action, key, freed in quota_actions:
+        st.toast(f"Session over {SESSION_QUOTA_MB:.0f} MB quota: {action} `{key}` ({freed / 1024:.0f} KB)", icon="🧹")
+
 # ─────────────────────────────────────────────
 # CACHING DEMO
 # ─────────────────────────────────────────────
-@st.cache_data
+@st.cache_data(max_entries=4, ttl=3600)
 def generate_large_dataset(rows=500):
     np.random.seed(42)
     dates = pd.date_range(start="2023-01-01", periods=rows, freq="D")
@@ -101,10 +146,123 @@ def generate_large_dataset(rows=500):
 @st.cache_resource
 def load_model_mock():
     time.sleep(0.1)
-    return {"name": "MockML v2.0", "accuracy": 0.947, "loaded": True}
+    return {"name": MockModel.name, "accuracy": 0.947, "loaded": True, "model": MockModel()}
+
+@st.cache_resource
+def get_inference_service():
+    # One batching worker shared by every session.
+    return InferenceService(load_model_mock()["model"].predict)
 
 df = generate_large_dataset()
 model = load_model_mock()
+inference = get_inference_service()
+
+# ─────────────────────────────────────────────
+# RESULT CACHE (shared across sessions)
+# ─────────────────────────────────────────────
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+def filter_key(regions, platforms, date_range):
+    dr = tuple(str(d) for d in date_range) if len(date_range) == 2 else ()
+    return (tuple(sorted(regions)), tuple(sorted(platforms)), dr)
+
+result_cache = get_result_cache()
+
+@st.cache_resource
+def get_aggregator(_frame):
+    return ParallelAggregator(_frame)
+
+aggregator = get_aggregator(df)
+
+# ─────────────────────────────────────────────
+# ARROW DATA PATH
+# ─────────────────────────────────────────────
+# The dataset is converted to Arrow once; filtered views are Arrow takes and
+# display widgets get zero-copy slices, so nothing is re-serialized per rerun.
+@st.cache_resource
+def get_arrow_dataset(_frame):
+    return pa.Table.from_pandas(_frame, preserve_index=False)
+
+def arrow_filter(table, regions, platforms, date_range):
+    mask = pc.and_(
+        pc.is_in(table["Region"], value_set=pa.array(list(regions), pa.string())),
+        pc.is_in(table["Platform"], value_set=pa.array(list(platforms), pa.string())),
+    )
+    if len(date_range) == 2:
+        ts_type = table.schema.field("Date").type
+        start = pa.scalar(pd.Timestamp(date_range[0]), ts_type)
+        end = pa.scalar(pd.Timestamp(date_range[1]) + pd.Timedelta(days=1), ts_type)
+        mask = pc.and_(mask, pc.and_(pc.greater_equal(table["Date"], start), pc.less(table["Date"], end)))
+    return table.take(pc.indices_nonzero(mask))
+
+arrow_df = get_arrow_dataset(df)
+
+BASE_METRICS = ["Revenue", "Users", "Sessions", "Bounce_Rate", "Conversion"]
+
+@st.cache_resource(max_entries=64)
+def compile_expression(source):
+    return CompiledExpression(source, NUMERIC_COLUMNS)
+
+@st.cache_resource
+def get_time_rollup(_frame):
+    return TimeRollup(_frame, BASE_METRICS)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def profile_uploaded_csv(file_hash, _file):
+    _file.seek(0)
+    return profile_csv(_file)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def summarize_uploaded_audio(file_hash, _file, name, size):
+    return audio_summary(_file, name, size)
+
+# ─────────────────────────────────────────────
+# STREAMING EXPORT
+# ─────────────────────────────────────────────
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+def iter_filtered_chunks(source, regions, platforms, date_range, chunk_rows=100_000):
+    # Filter slice by slice so only one chunk of the selection is alive at a time.
+    start = end = None
+    if len(date_range) == 2:
+        start, end = pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]) + pd.Timedelta(days=1)
+    for lo in range(0, len(source), chunk_rows):
+        part = source.iloc[lo:lo + chunk_rows]
+        mask = part["Region"].isin(regions) & part["Platform"].isin(platforms)
+        if start is not None:
+            mask &= (part["Date"] >= start) & (part["Date"] < end)
+        if mask.any():
+            yield part[mask]
+
+def export_chunks(chunks, fmt, out, schema):
+    # Writes chunks straight to `out` (a binary file) and returns rows written.
+    # The writer is opened from the source schema up front, so an empty
+    # selection still yields a valid header-only CSV/Parquet/Arrow file.
+    rows = 0
+    writer = None
+    if fmt == "CSV":
+        out.write((",".join(schema.names) + "\n").encode("utf-8"))
+    elif fmt == "Parquet":
+        writer = pq.ParquetWriter(out, schema)
+    else:
+        writer = pa.ipc.new_file(out, schema)
+    try:
+        for chunk in chunks:
+            if fmt == "CSV":
+                out.write(chunk.to_csv(index=False, header=False).encode("utf-8"))
+            else:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
 
 # ─────────────────────────────────────────────
 # SIDEBAR
@@ -146,6 +304,10 @@ with st.sidebar:
         st.divider()
         st.markdown("### 🐛 Debug")
         st.json({"session_keys": list(st.session_state.keys()), "df_shape": list(df.shape)})
+        st.markdown("**Result cache**")
+        st.json(result_cache.snapshot())
+        st.markdown("**Inference service**")
+        st.json(inference.metrics())
 
 # ─────────────────────────────────────────────
 # ══════════════ PAGE: HOME ══════════════
@@ -266,9 +428,21 @@ elif page == "📊 Analytics":
     st.title("📊 Analytics Dashboard")
     st.caption("Real-time data analysis powered by Streamlit + Pandas + NumPy")
 
+    # A valid computed metric becomes an extra Primary Metric option. Its text
+    # input is rendered below the filters, so read the value from session state.
+    computed = None
+    computed_error = None
+    computed_src = st.session_state.get("computed_expr", "").strip()
+    if computed_src:
+        try:
+            computed = compile_expression(computed_src)
+        except ExpressionError as exc:
+            computed_error = str(exc)
+    metric_options = BASE_METRICS + ([f"ƒ {computed.source}"] if computed else [])
+
     # Filters
     with st.container():
-        f1, f2, f3, f4 = st.columns(4)
+        f1, f2, f3, f4, f5 = st.columns([3, 3, 3, 2, 2])
         with f1:
             region_filter = st.multiselect("🌍 Region", df["Region"].unique().tolist(), default=df["Region"].unique().tolist())
         with f2:
@@ -279,23 +453,47 @@ elif page == "📊 Analytics":
                 value=(date(2023, 1, 1), date(2023, 12, 31)),
             )
         with f4:
-            metric_choice = st.selectbox("📈 Primary Metric", ["Revenue", "Users", "Sessions", "Bounce_Rate", "Conversion"])
+            metric_choice = st.selectbox("📈 Primary Metric", metric_options)
+        with f5:
+            granularity_choice = st.selectbox("🗓️ Granularity", ["Auto"] + list(GRANULARITIES))
+        st.text_input(
+            "ƒ Computed Metric",
+            key="computed_expr",
+            placeholder="e.g. Revenue / Sessions  ·  Users * Conversion  ·  sqrt(Users)",
+            help="Arithmetic over " + ", ".join(NUMERIC_COLUMNS) + " with abs, sqrt, log, exp, min, max",
+        )
+        if computed_error:
+            st.error(computed_error, icon="🚨")
 
-    filtered_df = df[df["Region"].isin(region_filter) & df["Platform"].isin(platform_filter)]
-    if len(date_range) == 2:
-        start, end = date_range
-        filtered_df = filtered_df[
-            (filtered_df["Date"].dt.date >= start) & (filtered_df["Date"].dt.date <= end)
-        ]
+    fkey = filter_key(region_filter, platform_filter, date_range)
+
+    def compute_filtered():
+        out = df[df["Region"].isin(region_filter) & df["Platform"].isin(platform_filter)]
+        if len(date_range) == 2:
+            start, end = date_range
+            out = out[(out["Date"].dt.date >= start) & (out["Date"].dt.date <= end)]
+        return out
+
+    filtered_df = result_cache.get_or_compute(("filtered", fkey), compute_filtered)
+    is_computed = metric_choice not in BASE_METRICS
+    # Quantiles and rolling windows run on the shared dataset columns only.
+    analysis_metric = "Revenue" if is_computed else metric_choice
 
     st.divider()
 
     # KPI Row
     k1, k2, k3, k4 = st.columns(4)
-    k1.metric("Avg Revenue/Day", f"${filtered_df['Revenue'].mean():,.0f}", f"{filtered_df['Revenue'].pct_change().mean()*100:.2f}%")
-    k2.metric("Total Users", f"{filtered_df['Users'].sum():,}")
-    k3.metric("Avg Bounce Rate", f"{filtered_df['Bounce_Rate'].mean()*100:.1f}%")
-    k4.metric("Avg Conversion", f"{filtered_df['Conversion'].mean()*100:.2f}%")
+    kpis = result_cache.get_or_compute(("kpis", fkey), lambda: {
+        "revenue": filtered_df["Revenue"].mean(),
+        "revenue_change": filtered_df["Revenue"].pct_change().mean(),
+        "users": int(filtered_df["Users"].sum()),
+        "bounce": filtered_df["Bounce_Rate"].mean(),
+        "conversion": filtered_df["Conversion"].mean(),
+    })
+    k1.metric("Avg Revenue/Day", f"${kpis['revenue']:,.0f}", f"{kpis['revenue_change']*100:.2f}%")
+    k2.metric("Total Users", f"{kpis['users']:,}")
+    k3.metric("Avg Bounce Rate", f"{kpis['bounce']*100:.1f}%")
+    k4.metric("Avg Conversion", f"{kpis['conversion']*100:.2f}%")
 
     st.divider()
 
@@ -303,22 +501,45 @@ elif page == "📊 Analytics":
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 Line", "📊 Bar", "🏔️ Area", "🔵 Scatter", "🗺️ Map"])
 
     with tab1:
-        st.subheader(f"{metric_choice} Over Time")
-        st.line_chart(filtered_df.set_index("Date")[metric_choice], use_container_width=True)
+        if len(date_range) == 2:
+            span_start, span_end = date_range
+        else:
+            span_start, span_end = df["Date"].min().date(), df["Date"].max().date()
+        if granularity_choice == "Auto":
+            granularity = default_granularity((span_end - span_start).days + 1)
+        else:
+            granularity = granularity_choice
+        # Computed metrics are averaged per bucket, like every non-additive metric.
+        agg_label = "Avg" if is_computed else aggregation_label(metric_choice)
+        st.subheader(f"{agg_label} {metric_choice} per {granularity}")
+        if is_computed:
+            def compute_line():
+                daily = pd.Series(computed.evaluate(filtered_df), index=filtered_df["Date"], name=metric_choice)
+                if granularity == "Day":
+                    return daily
+                return daily.groupby(daily.index.to_period(GRANULARITIES[granularity]).start_time).mean()
+
+            line_data = result_cache.get_or_compute(("line", fkey, metric_choice, granularity), compute_line)
+        else:
+            line_data = result_cache.get_or_compute(
+                ("line", fkey, metric_choice, granularity),
+                lambda: get_time_rollup(df).query(metric_choice, region_filter, platform_filter, span_start, span_end, granularity),
+            )
+        st.line_chart(line_data, use_container_width=True)
 
     with tab2:
         st.subheader("Users by Region")
-        region_data = filtered_df.groupby("Region")["Users"].sum().reset_index()
-        st.bar_chart(region_data.set_index("Region"), use_container_width=True)
+        region_data = result_cache.get_or_compute(("region_users", fkey), lambda: filtered_df.groupby("Region")["Users"].sum().to_frame())
+        st.bar_chart(region_data, use_container_width=True)
 
     with tab3:
         st.subheader("Revenue & Users — Area Chart")
-        area_data = filtered_df.set_index("Date")[["Revenue", "Users"]].head(100)
+        area_data = result_cache.get_or_compute(("area", fkey), lambda: filtered_df.set_index("Date")[["Revenue", "Users"]].head(100))
         st.area_chart(area_data, use_container_width=True)
 
     with tab4:
         st.subheader("Sessions vs Revenue (Scatter)")
-        scatter_data = filtered_df[["Sessions", "Revenue"]].rename(columns={"Sessions": "x", "Revenue": "y"})
+        scatter_data = result_cache.get_or_compute(("scatter", fkey), lambda: filtered_df[["Sessions", "Revenue"]].rename(columns={"Sessions": "x", "Revenue": "y"}))
         st.scatter_chart(scatter_data, x="x", y="y", use_container_width=True)
 
     with tab5:
@@ -331,22 +552,132 @@ elif page == "📊 Analytics":
 
     st.divider()
 
+    # Heavy analyses (partitioned across a process pool on large datasets)
+    st.markdown("### 🧮 Advanced Analyses")
+    an1, an2 = st.columns([1, 3])
+    with an1:
+        analysis = st.radio("Analysis", ["Rolling Mean", "Quantiles by Region", "Cohort Retention"])
+        window = st.slider("Rolling Window (days)", 3, 60, 7) if analysis == "Rolling Mean" else None
+        mode = "process pool" if aggregator.parallel else "in-process"
+        st.caption(f"Engine: {mode} · {aggregator.workers} workers")
+        if is_computed and analysis != "Cohort Retention":
+            st.caption("Computed metrics aren't supported here; showing Revenue")
+    with an2:
+        agg_filter = aggregator.make_filter(region_filter, platform_filter, date_range)
+        with st.spinner(f"Computing {analysis.lower()}..."):
+            if analysis == "Rolling Mean":
+                rolled = result_cache.get_or_compute(
+                    ("rolling", fkey, analysis_metric, window),
+                    lambda: aggregator.rolling(agg_filter, analysis_metric, window),
+                )
+                st.line_chart(rolled, use_container_width=True)
+            elif analysis == "Quantiles by Region":
+                quant = result_cache.get_or_compute(
+                    ("quantiles", fkey, analysis_metric),
+                    lambda: aggregator.quantiles(agg_filter, analysis_metric),
+                )
+                st.dataframe(quant, use_container_width=True)
+            else:
+                retention = result_cache.get_or_compute(
+                    ("cohort", fkey), lambda: aggregator.cohort_retention(agg_filter),
+                )
+                st.caption("Monthly Users relative to each region's first month in range")
+                st.dataframe(retention.style.format("{:.0%}"), use_container_width=True)
+
+    st.divider()
+
     # Dataframe
     st.markdown("### 📋 Raw Data Explorer")
     rows_to_show = st.slider("Rows to show", 5, 100, 20)
+    arrow_view = result_cache.get_or_compute(
+        ("arrow", fkey), lambda: arrow_filter(arrow_df, region_filter, platform_filter, date_range),
+    )
+    # Revenue shading via column_config instead of a Styler, which would force
+    # a pandas → Arrow conversion of the styled frame on every rerun.
+    revenue_range = pc.min_max(arrow_view["Revenue"])
     st.dataframe(
-        filtered_df.head(rows_to_show).style.background_gradient(subset=["Revenue"], cmap="Blues"),
+        arrow_view.slice(0, rows_to_show),
         use_container_width=True,
         height=300,
+        column_config={
+            "Revenue": st.column_config.ProgressColumn(
+                "Revenue",
+                format="%.0f",
+                min_value=revenue_range["min"].as_py() or 0,
+                max_value=revenue_range["max"].as_py() or 1,
+            ),
+        },
     )
+    if show_debug:
+        t0 = time.perf_counter()
+        pa.Table.from_pandas(filtered_df.head(rows_to_show))
+        pandas_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        arrow_view.slice(0, rows_to_show)
+        arrow_ms = (time.perf_counter() - t0) * 1000
+        st.caption(f"🐛 pandas → Arrow: {pandas_ms:.2f} ms · Arrow slice: {arrow_ms:.3f} ms per render")
 
     col_a, col_b = st.columns(2)
     with col_a:
         st.markdown("### 📌 Static Table (Top 5)")
-        st.table(filtered_df[["Date", "Revenue", "Users", "Region"]].head(5))
+        st.table(arrow_view.select(["Date", "Revenue", "Users", "Region"]).slice(0, 5))
     with col_b:
         st.markdown("### 📦 JSON Sample")
-        st.json(filtered_df.head(3).to_dict(orient="records"))
+        st.json(arrow_view.slice(0, 3).to_pylist())
+
+    st.markdown(f"### 🤖 Score Selection · {model['name']}")
+    scores = None
+    if st.button("🎯 Score Filtered Rows"):
+        futures = []
+
+        def score_selection():
+            # Keep the future so a timed-out request can be pulled off the shared queue.
+            futures.append(inference.submit(filtered_df[FEATURES].to_numpy()))
+            return pd.Series(futures[-1].result(timeout=60), index=filtered_df["Date"], name="Score")
+
+        with st.spinner(f"Scoring {len(filtered_df):,} rows..."):
+            try:
+                scores = result_cache.get_or_compute(("scores", fkey), score_selection)
+            except FutureTimeoutError:
+                for f in futures:
+                    f.cancel()
+                st.error("Scoring timed out — the inference service is busy. Try again shortly.", icon="🚨")
+    if scores is not None:
+        sc1, sc2, sc3 = st.columns(3)
+        sc1.metric("Rows Scored", f"{len(scores):,}")
+        sc2.metric("Mean Score", f"{scores.mean():.3f}")
+        sc3.metric("High Propensity (>0.7)", f"{(scores > 0.7).mean() * 100:.1f}%")
+        st.line_chart(scores, use_container_width=True, height=200)
+
+    st.markdown("### 💾 Export Filtered Data")
+    ex1, ex2 = st.columns([1, 2])
+    with ex1:
+        export_fmt = st.selectbox("Format", list(EXPORT_FORMATS))
+    with ex2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        # The button is only offered on the run that wrote the file, so later
+        # reruns never re-read the export and it can't go stale after a filter change.
+        if st.button("📦 Prepare Export"):
+            ext, mime = EXPORT_FORMATS[export_fmt]
+            # Spool to a temp file, then hand Streamlit a plain read handle
+            # (it rejects the read/write handle TemporaryFile returns). The
+            # button copies the bytes when it renders, so the file can go.
+            fd, path = tempfile.mkstemp(prefix="megadash_export_", suffix=f".{ext}")
+            try:
+                with os.fdopen(fd, "wb") as tmp, st.spinner("Writing export chunk by chunk..."):
+                    n_rows = export_chunks(
+                        iter_filtered_chunks(df, region_filter, platform_filter, date_range),
+                        export_fmt, tmp, arrow_df.schema,
+                    )
+                with open(path, "rb") as fh:
+                    st.download_button(
+                        f"⬇️ Download {export_fmt} ({n_rows:,} rows)",
+                        data=fh,
+                        file_name=f"analytics_export.{ext}",
+                        mime=mime,
+                    )
+            finally:
+                os.remove(path)
 
 # ─────────────────────────────────────────────
 # ══════════════ PAGE: WIDGETS GALLERY ════════
@@ -542,7 +873,39 @@ elif page == "📋 Forms & State":
         inner2.info("Right Column ℹ️")
 
     with st.expander("🔍 Click to see Session State"):
-        st.json(dict(st.session_state))
+        # Sizes come from the per-rerun accounting; only the visible page is rendered.
+        all_sessions = memory_registry.totals()
+        ss1, ss2, ss3 = st.columns(3)
+        ss1.metric("This Session", f"{sum(session_sizes.values()) / 1024:,.1f} KB", f"quota {SESSION_QUOTA_MB:.0f} MB", delta_color="off")
+        ss2.metric("All Sessions", f"{sum(all_sessions.values()) / 1024**2:,.2f} MB")
+        ss3.metric("Active Sessions", len(all_sessions))
+
+        page_size = 10
+        state_keys = sorted(session_sizes, key=session_sizes.get, reverse=True)
+        n_pages = max(1, math.ceil(len(state_keys) / page_size))
+        key_page = st.number_input("Key page", 1, n_pages, 1, key="inspector_key_page") - 1
+        visible_keys = [k for k in state_keys[key_page * page_size:(key_page + 1) * page_size] if k in st.session_state]
+        st.table(pd.DataFrame({
+            "key": visible_keys,
+            "type": [type(st.session_state[k]).__name__ for k in visible_keys],
+            "size (KB)": [round(session_sizes[k] / 1024, 2) for k in visible_keys],
+            "preview": [preview(st.session_state[k]) for k in visible_keys],
+        }))
+
+        if visible_keys:
+            inspect_key = st.selectbox("Inspect key", visible_keys, key="inspector_key")
+            value = st.session_state[inspect_key]
+            if isinstance(value, (list, tuple, dict, pd.DataFrame)) and len(value) > 0:
+                n_item_pages = max(1, math.ceil(len(value) / page_size))
+                item_page = st.number_input(f"Item page (of {n_item_pages})", 1, n_item_pages, 1, key="inspector_item_page") - 1
+                lo, hi = item_page * page_size, min((item_page + 1) * page_size, len(value))
+                if isinstance(value, pd.DataFrame):
+                    st.dataframe(value.iloc[lo:hi], use_container_width=True)
+                else:
+                    items = list(value.items())[lo:hi] if isinstance(value, dict) else [(i, value[i]) for i in range(lo, hi)]
+                    st.table(pd.DataFrame({"item": [str(i) for i, _ in items], "value": [preview(v) for _, v in items]}))
+            else:
+                st.code(preview(value))
 
     st.markdown("### 🧮 Live Calculator")
     calc_col1, calc_col2, calc_col3 = st.columns(3)
@@ -625,14 +988,37 @@ elif page == "📁 File Tools":
         st.markdown("### 📂 Upload CSV File")
         uploaded_csv = st.file_uploader("Choose a CSV file", type=["csv"])
         if uploaded_csv:
-            user_df = pd.read_csv(uploaded_csv)
-            st.success(f"✅ Loaded {len(user_df)} rows × {len(user_df.columns)} columns")
-            st.dataframe(user_df.head(10), use_container_width=True)
-            st.markdown("#### Quick Stats")
-            st.write(user_df.describe())
-            if st.button("📊 Chart First Column"):
-                col_name = user_df.select_dtypes(include=np.number).columns[0]
-                st.line_chart(user_df[col_name].head(50))
+            with st.spinner("Profiling file in one streaming pass..."):
+                report = profile_uploaded_csv(file_sha256(uploaded_csv), uploaded_csv)
+            uploaded_csv.seek(0)
+            st.success(f"✅ Profiled {report['rows']:,} rows × {len(report['summary'])} columns")
+            st.dataframe(pd.read_csv(uploaded_csv, nrows=10), use_container_width=True)
+            st.markdown("#### Profile")
+            st.caption("Distinct counts (HyperLogLog), quantiles (KLL) and top values are approximate")
+            st.dataframe(report["summary"], use_container_width=True)
+            numeric_cols = [c for c, h in report["histograms"].items() if h is not None]
+            if numeric_cols:
+                hist_col = st.selectbox("📊 Histogram Column", numeric_cols)
+                st.bar_chart(report["histograms"][hist_col])
+            missing = [c for c in FEATURES if c not in report["summary"].index]
+            if missing:
+                st.caption(f"🤖 Add columns {', '.join(missing)} to score this file with {model['name']}")
+            elif st.button("🤖 Score Rows"):
+                uploaded_csv.seek(0)
+                # Chunks are queued together so the service can batch them with other sessions' work.
+                futures = [
+                    inference.submit(chunk[FEATURES].to_numpy())
+                    for chunk in pd.read_csv(uploaded_csv, usecols=FEATURES, chunksize=50_000)
+                ]
+                try:
+                    scores = np.concatenate([f.result(timeout=60) for f in futures]) if futures else np.empty(0)
+                except FutureTimeoutError:
+                    for f in futures:
+                        f.cancel()
+                    st.error("Scoring timed out — the inference service is busy. Try again shortly.", icon="🚨")
+                else:
+                    st.success(f"✅ Scored {len(scores):,} rows · mean score {scores.mean() if len(scores) else float('nan'):.3f}")
+                    st.bar_chart(pd.Series(np.histogram(scores, bins=20, range=(0, 1))[0], index=np.linspace(0, 0.95, 20).round(2), name="rows"))
         else:
             st.info("Upload any CSV file to explore it here!", icon="📂")
 
@@ -678,6 +1064,25 @@ elif page == "📁 File Tools":
     if uploaded_audio:
         st.audio(uploaded_audio, format=uploaded_audio.type)
         st.success(f"Playing: {uploaded_audio.name}")
+        try:
+            with st.spinner("Reading audio..."):
+                audio_info = summarize_uploaded_audio(
+                    file_sha256(uploaded_audio), uploaded_audio, uploaded_audio.name, uploaded_audio.size,
+                )
+        except AudioFormatError as exc:
+            st.warning(f"Couldn't read audio details: {exc}", icon="⚠️")
+        else:
+            meta = audio_info["meta"]
+            au1, au2, au3 = st.columns(3)
+            au1.metric("Duration", str(timedelta(seconds=round(meta["duration"]))))
+            au2.metric("Sample Rate", f"{meta['sample_rate']:,} Hz")
+            au3.metric("Channels", meta["channels"])
+            if audio_info["peaks"] is not None:
+                lows, highs = audio_info["peaks"]
+                seconds = np.arange(len(lows)) * (meta["duration"] / max(len(lows), 1))
+                st.area_chart(pd.DataFrame({"max": highs, "min": lows}, index=pd.Index(seconds, name="seconds")), height=180)
+            else:
+                st.caption("Waveform preview is available for WAV files")
     else:
         st.info("Upload an audio file to play it in-browser!", icon="🎵")
 
@@ -0,0 +1,182 @@
+import struct
+
+import numpy as np
+
+# Header-only metadata for WAV/MP3/OGG uploads and a streaming min/max peak
+# envelope for WAV. Memory stays bounded by one read block regardless of
+# recording length.
+
+READ_BYTES = 1 << 20
+
+_WAVE_PCM = 0x0001
+_WAVE_FLOAT = 0x0003
+_WAVE_EXTENSIBLE = 0xFFFE
+
+
+class AudioFormatError(ValueError):
+    pass
+
+
+def read_wav_header(fh):
+    fh.seek(0)
+    riff = fh.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        raise AudioFormatError("Not a RIFF/WAVE file")
+    fmt = None
+    while True:
+        header = fh.read(8)
+        if len(header) < 8:
+            raise AudioFormatError("WAV file has no data chunk")
+        chunk_id, size = struct.unpack("<4sI", header)
+        if chunk_id == b"fmt ":
+            body = fh.read(size)
+            if size < 16 or len(body) < 16:
+                raise AudioFormatError("WAV fmt chunk is truncated")
+            tag, channels, rate, _, block_align, bits = struct.unpack("<HHIIHH", body[:16])
+            if tag == _WAVE_EXTENSIBLE and len(body) >= 26:
+                tag = struct.unpack("<H", body[24:26])[0]
+            if not channels or not rate or not bits:
+                raise AudioFormatError("WAV header has zero channels, sample rate or sample width")
+            if block_align != channels * ((bits + 7) // 8):
+                raise AudioFormatError(f"WAV block align {block_align} doesn't match {channels} x {bits}-bit samples")
+            fmt = {"format": tag, "channels": channels, "sample_rate": rate, "block_align": block_align, "bits": bits}
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise AudioFormatError("WAV data chunk precedes fmt chunk")
+            fmt["data_offset"] = fh.tell()
+            fmt["frames"] = size // fmt["block_align"]
+            fmt["duration"] = fmt["frames"] / fmt["sample_rate"]
+            return fmt
+        else:
+            fh.seek(size, 1)
+        if size % 2:
+            fh.seek(1, 1)
+
+
+def _decode(raw, fmt):
+    bits, tag = fmt["bits"], fmt["format"]
+    if tag == _WAVE_FLOAT and bits == 32:
+        return np.frombuffer(raw, dtype="<f4")
+    if tag == _WAVE_FLOAT and bits == 64:
+        return np.frombuffer(raw, dtype="<f8")
+    if tag != _WAVE_PCM:
+        raise AudioFormatError(f"Unsupported WAV encoding (format tag {tag:#x})")
+    if bits == 8:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    if bits == 16:
+        return np.frombuffer(raw, dtype="<i2") / np.float32(1 << 15)
+    if bits == 24:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        return ((b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8) / np.float32(1 << 23)
+    if bits == 32:
+        return np.frombuffer(raw, dtype="<i4") / np.float32(1 << 31)
+    raise AudioFormatError(f"Unsupported WAV sample width ({bits} bits)")
+
+
+def wav_peaks(fh, fmt, buckets=1000):
+    # Returns (min, max) arrays of length <= buckets, mixed down to mono.
+    frames = fmt["frames"]
+    if not frames:
+        return np.zeros(0, np.float32), np.zeros(0, np.float32)
+    per_bucket = max(1, -(-frames // buckets))
+    n_buckets = -(-frames // per_bucket)
+    lows = np.empty(n_buckets, np.float32)
+    highs = np.empty(n_buckets, np.float32)
+    block_frames = max(1, READ_BYTES // (fmt["block_align"] * per_bucket)) * per_bucket
+    fh.seek(fmt["data_offset"])
+    done = 0
+    b = 0
+    while done < frames:
+        want = min(block_frames, frames - done)
+        raw = fh.read(want * fmt["block_align"])
+        got = len(raw) // fmt["block_align"]
+        if not got:
+            break
+        samples = _decode(raw[:got * fmt["block_align"]], fmt).reshape(got, fmt["channels"]).mean(axis=1)
+        full = got // per_bucket
+        if full:
+            view = samples[:full * per_bucket].reshape(full, per_bucket)
+            lows[b:b + full] = view.min(axis=1)
+            highs[b:b + full] = view.max(axis=1)
+            b += full
+        if got % per_bucket:
+            tail = samples[full * per_bucket:]
+            lows[b], highs[b] = tail.min(), tail.max()
+            b += 1
+        done += got
+    return lows[:b], highs[:b]
+
+
+# ── non-WAV headers ──────────────────────────────────────────────────────
+
+_MP3_BITRATES = {
+    3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],  # MPEG-1 Layer III
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],      # MPEG-2/2.5 Layer III
+}
+_MP3_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def read_mp3_header(fh, size):
+    fh.seek(0)
+    head = fh.read(10)
+    offset = 0
+    if head[:3] == b"ID3" and len(head) == 10:
+        offset = 10 + ((head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14 | (head[8] & 0x7F) << 7 | (head[9] & 0x7F))
+    fh.seek(offset)
+    buf = fh.read(64 * 1024)
+    for i in range(len(buf) - 4):
+        if buf[i] == 0xFF and (buf[i + 1] & 0xE0) == 0xE0:
+            version = (buf[i + 1] >> 3) & 0x3
+            layer = (buf[i + 1] >> 1) & 0x3
+            bitrate_idx = buf[i + 2] >> 4
+            rate_idx = (buf[i + 2] >> 2) & 0x3
+            if version == 1 or layer != 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+                continue
+            bitrate = _MP3_BITRATES[3 if version == 3 else 2][bitrate_idx] * 1000
+            rate = _MP3_RATES[version][rate_idx]
+            channels = 1 if (buf[i + 3] >> 6) == 3 else 2
+            # Assumes constant bitrate; VBR files get an estimate.
+            return {"sample_rate": rate, "channels": channels, "bitrate": bitrate,
+                    "duration": (size - offset - i) * 8 / bitrate}
+    raise AudioFormatError("No MPEG audio frame found")
+
+
+def read_ogg_header(fh, size):
+    fh.seek(0)
+    head = fh.read(4096)
+    pos = head.find(b"\x01vorbis")
+    if not head.startswith(b"OggS") or pos < 0:
+        raise AudioFormatError("Only Ogg Vorbis streams are supported")
+    if len(head) < pos + 16:
+        raise AudioFormatError("Vorbis identification header is truncated")
+    channels, rate = struct.unpack("<BI", head[pos + 11:pos + 16])
+    if not channels or not rate:
+        raise AudioFormatError("Vorbis header has zero channels or sample rate")
+    # Duration comes from the granule position of the last page.
+    fh.seek(max(0, size - 64 * 1024))
+    tail = fh.read()
+    last = tail.rfind(b"OggS")
+    granule = struct.unpack("<q", tail[last + 6:last + 14])[0] if 0 <= last <= len(tail) - 14 else 0
+    return {"sample_rate": rate, "channels": channels, "duration": max(granule, 0) / rate}
+
+
+def audio_summary(fh, name, size, buckets=1000):
+    try:
+        return _audio_summary(fh, name, size, buckets)
+    except struct.error as exc:
+        # Backstop for header layouts the explicit checks above don't cover.
+        raise AudioFormatError(f"Malformed audio header: {exc}") from None
+
+
+def _audio_summary(fh, name, size, buckets):
+    ext = name.rsplit(".", 1)[-1].lower()
+    if ext == "wav":
+        fmt = read_wav_header(fh)
+        lows, highs = wav_peaks(fh, fmt, buckets)
+        meta = {k: fmt[k] for k in ("sample_rate", "channels", "bits", "frames", "duration")}
+        return {"meta": meta, "peaks": (lows, highs)}
+    if ext == "mp3":
+        return {"meta": read_mp3_header(fh, size), "peaks": None}
+    if ext == "ogg":
+        return {"meta": read_ogg_header(fh, size), "peaks": None}
+    raise AudioFormatError(f"Unsupported audio type: .{ext}")
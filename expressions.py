@@ -0,0 +1,137 @@
+import ast
+
+import numpy as np
+
+# A tiny arithmetic language over dataset columns, e.g. "Revenue / Sessions"
+# or "sqrt(Users) * Conversion". Expressions are parsed with `ast`, checked
+# against a whitelist and compiled to a flat list of ufunc calls that run
+# chunk by chunk into a few reused register buffers, so no full-length
+# temporaries are allocated besides the result.
+
+CHUNK_ROWS = 64 * 1024
+
+# The compiler recurses once per nesting level; anything deeper than this is
+# rejected up front instead of hitting Python's recursion limit.
+MAX_DEPTH = 100
+
+_BINOPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.Pow: np.power,
+    ast.Mod: np.mod,
+}
+_UNARY = {ast.USub: np.negative, ast.UAdd: np.positive}
+_FUNCS = {
+    "abs": (np.absolute, 1),
+    "sqrt": (np.sqrt, 1),
+    "log": (np.log, 1),
+    "exp": (np.exp, 1),
+    "min": (np.minimum, 2),
+    "max": (np.maximum, 2),
+}
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+def _depth(tree):
+    # Iterative, so measuring a pathological tree can't overflow the stack itself.
+    deepest = 0
+    stack = [(tree, 1)]
+    while stack:
+        node, depth = stack.pop()
+        deepest = max(deepest, depth)
+        stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+    return deepest
+
+
+class CompiledExpression:
+    def __init__(self, source, columns):
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as exc:
+            raise ExpressionError(f"Syntax error: {exc.msg}") from None
+        except (RecursionError, MemoryError):
+            raise ExpressionError("Expression is nested too deeply") from None
+        if _depth(tree) > MAX_DEPTH:
+            raise ExpressionError(f"Expression is nested too deeply (limit {MAX_DEPTH} levels)")
+        self.columns = set(columns)
+        self.source = ast.unparse(tree)
+        self.used_columns = []
+        self.program = []
+        self._free = []
+        self.n_registers = 0
+        self.result = self._emit(tree.body)
+
+    def _alloc(self):
+        if self._free:
+            return self._free.pop()
+        self.n_registers += 1
+        return self.n_registers - 1
+
+    def _release(self, *operands):
+        for kind, value in operands:
+            if kind == "reg":
+                self._free.append(value)
+
+    def _emit(self, node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            try:
+                return ("const", float(node.value))
+            except OverflowError:
+                raise ExpressionError("Number is too large for a float") from None
+        if isinstance(node, ast.Name):
+            if node.id not in self.columns:
+                raise ExpressionError(f"Unknown column '{node.id}'. Available: {', '.join(sorted(self.columns))}")
+            if node.id not in self.used_columns:
+                self.used_columns.append(node.id)
+            return ("col", node.id)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+            return self._op(_BINOPS[type(node.op)], [node.left, node.right])
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+            return self._op(_UNARY[type(node.op)], [node.operand])
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCS and not node.keywords:
+            ufunc, arity = _FUNCS[node.func.id]
+            if len(node.args) != arity:
+                raise ExpressionError(f"{node.func.id}() takes {arity} argument(s)")
+            return self._op(ufunc, node.args)
+        raise ExpressionError(f"Unsupported syntax: {ast.unparse(node)}")
+
+    def _op(self, ufunc, children):
+        operands = [self._emit(child) for child in children]
+        if all(kind == "const" for kind, _ in operands):
+            with np.errstate(all="ignore"):
+                return ("const", float(ufunc(*[value for _, value in operands])))
+        self._release(*operands)
+        dst = self._alloc()
+        self.program.append((ufunc, operands, dst))
+        return ("reg", dst)
+
+    def evaluate(self, frame, chunk_rows=CHUNK_ROWS):
+        n = len(frame)
+        out = np.empty(n, dtype=np.float64)
+        kind, value = self.result
+        if kind != "reg":
+            # Same non-finite → NaN rule as the vectorized path below.
+            out[:] = frame[value].to_numpy(np.float64) if kind == "col" else value
+            np.copyto(out, np.nan, where=~np.isfinite(out))
+            return out
+        arrays = {col: frame[col].to_numpy() for col in self.used_columns}
+        registers = [np.empty(min(chunk_rows, n), dtype=np.float64) for _ in range(self.n_registers)]
+        with np.errstate(all="ignore"):
+            for lo in range(0, n, chunk_rows):
+                hi = min(lo + chunk_rows, n)
+                regs = [r[:hi - lo] for r in registers]
+                # The root writes straight into the output slice.
+                regs[value] = out[lo:hi]
+                for ufunc, operands, dst in self.program:
+                    args = [
+                        regs[v] if k == "reg" else arrays[v][lo:hi] if k == "col" else v
+                        for k, v in operands
+                    ]
+                    ufunc(*args, out=regs[dst], dtype=np.float64)
+                np.copyto(regs[value], np.nan, where=~np.isfinite(regs[value]))
+        return out
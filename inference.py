@@ -0,0 +1,125 @@
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+# Shared scoring service: requests from every session go onto one queue,
+# a worker thread groups them into micro-batches (flushed on size or
+# deadline) and runs a single vectorized predict per batch.
+
+FEATURES = ["Users", "Sessions", "Bounce_Rate", "Conversion", "Satisfaction"]
+
+
+class MockModel:
+    # Deterministic logistic scorer over FEATURES; same input, same output.
+    name = "MockML v2.0"
+
+    def __init__(self):
+        self.mean = np.array([550.0, 1100.0, 0.5, 0.08, 3.8])
+        self.scale = np.array([260.0, 520.0, 0.17, 0.04, 1.1])
+        self.weights = np.array([0.6, 0.3, -0.9, 1.2, 0.5])
+        self.bias = -0.2
+
+    def predict(self, X):
+        z = ((np.asarray(X, dtype=np.float64) - self.mean) / self.scale) @ self.weights + self.bias
+        return 1.0 / (1.0 + np.exp(-np.clip(z, -500, 500)))
+
+
+class InferenceService:
+    def __init__(self, predict, max_batch_rows=4096, max_wait_ms=10, latency_window=2048):
+        self.predict = predict
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._requests = 0
+        self._rows = 0
+        self._batches = 0
+        self._busy = 0.0
+        self._batch_sizes = Counter()
+        self._queue_latency = deque(maxlen=latency_window)
+        self._worker = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, X):
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        future = Future()
+        if len(X) == 0:
+            future.set_result(np.empty(0))
+            return future
+        self._queue.put((X, future, time.monotonic()))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        rows = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch, rows
+
+    def _run(self):
+        # Never let one bad batch or caller kill the worker every session shares.
+        while True:
+            try:
+                self._process(self._collect()[0])
+            except Exception:
+                continue
+
+    def _process(self, batch):
+        # Drop requests whose callers already cancelled; the rest become "running".
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        start = time.monotonic()
+        try:
+            scores = self.predict(np.concatenate([X for X, _, _ in batch]))
+        except Exception as exc:
+            for _, future, _ in batch:
+                future.set_exception(exc)
+            return
+        done = time.monotonic()
+        rows = sum(len(X) for X, _, _ in batch)
+        offset = 0
+        for X, future, _ in batch:
+            future.set_result(scores[offset:offset + len(X)])
+            offset += len(X)
+        with self._lock:
+            self._requests += len(batch)
+            self._rows += rows
+            self._batches += 1
+            self._busy += done - start
+            # Power-of-two buckets keep the distribution small.
+            self._batch_sizes[1 << max(rows - 1, 0).bit_length()] += 1
+            self._queue_latency.extend(start - enqueued for _, _, enqueued in batch)
+
+    def metrics(self):
+        with self._lock:
+            uptime = time.monotonic() - self._started
+            lat = np.array(self._queue_latency) * 1000
+            p50, p95, p99 = np.percentile(lat, [50, 95, 99]) if len(lat) else (0.0, 0.0, 0.0)
+            return {
+                "requests": self._requests,
+                "rows": self._rows,
+                "batches": self._batches,
+                "queued": self._queue.qsize(),
+                "rows_per_s": self._rows / uptime if uptime else 0.0,
+                "rows_per_busy_s": self._rows / self._busy if self._busy else 0.0,
+                "avg_batch_rows": self._rows / self._batches if self._batches else 0.0,
+                "queue_p50_ms": p50,
+                "queue_p95_ms": p95,
+                "queue_p99_ms": p99,
+                "batch_sizes": dict(sorted(self._batch_sizes.items())),
+            }
@@ -0,0 +1,399 @@
+"""Concurrent-session load test for the dashboard.
+
+Starts ``streamlit run app.py`` on a local port and drives N simulated
+browser sessions over Streamlit's websocket protocol (/_stcore/stream),
+replaying a weighted mix of page switches, filter changes, CSV uploads and
+chat turns. Reports rerun latency percentiles, throughput and server memory
+for each N. Runs fully offline.
+
+The server is started with ``--server.enableXsrfProtection false`` so the
+simulated uploads can PUT files without a browser's XSRF cookie/header
+pair. Only use it against this throwaway local server.
+
+The websocket client is the ``websockets`` package Streamlit itself
+depends on; plain HTTP (health check, uploads) goes through urllib.
+
+    python loadtest.py --sessions 1,5,10,25 --actions 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+
+import numpy as np
+import websockets
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+PAGES = ["🏠 Home", "📊 Analytics", "🎛️ Widgets Gallery", "📋 Forms & State",
+         "🤖 AI Chat", "📁 File Tools", "🎨 Media & Visuals", "ℹ️ About"]
+# Text each page renders (a title or label); a page switch is only counted
+# once its marker shows up in the rerun's output.
+PAGE_MARKERS = {
+    "🏠 Home": "🌍 Total Users",
+    "📊 Analytics": "📊 Analytics Dashboard",
+    "🎛️ Widgets Gallery": "🎛️ Complete Widgets Gallery",
+    "📋 Forms & State": "📋 Forms, State & Interactivity",
+    "🤖 AI Chat": "🤖 AI Assistant Chat",
+    "📁 File Tools": "📁 File Upload & Processing",
+    "🎨 Media & Visuals": "🎨 Media, Text & Visual Elements",
+    "ℹ️ About": "ℹ️ About This App",
+}
+DEFAULT_MIX = {"page": 0.4, "filter": 0.3, "upload": 0.1, "chat": 0.2}
+CHAT_PROMPTS = ["hello", "what is streamlit?", "tell me about caching", "cloud", "random question"]
+
+
+# ─────────────────────────────────────────────
+# SERVER
+# ─────────────────────────────────────────────
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def http(method, url, body=None, headers=None, timeout=30):
+    # Blocking; run it via asyncio.to_thread so sessions keep overlapping.
+    request = urllib.request.Request(url, data=body, headers=headers or {}, method=method)
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+async def start_server(port, timeout=60):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP,
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.address", "127.0.0.1", "--browser.gatherUsageStats", "false",
+         # Uploads PUT straight to /_stcore/upload_file; see the module docstring.
+         "--server.enableXsrfProtection", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {proc.returncode}")
+        try:
+            await asyncio.to_thread(http, "GET", f"http://127.0.0.1:{port}/_stcore/health", timeout=2)
+            return proc
+        except Exception:
+            await asyncio.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("streamlit did not become healthy in time")
+
+
+# ─────────────────────────────────────────────
+# SIMULATED BROWSER SESSION
+# ─────────────────────────────────────────────
+class ProtocolError(RuntimeError):
+    # The server didn't react the way a browser would see it; timings would be meaningless.
+    pass
+
+
+def option_state(widget, selected):
+    # Newer Streamlit sends option widgets' values as strings (their protos
+    # carry raw_value/raw_values); older releases sent option indices.
+    state = WidgetState(id=widget.id)
+    fields = widget.DESCRIPTOR.fields_by_name
+    if "raw_value" in fields:
+        state.string_value = widget.options[selected]
+    elif "raw_values" in fields:
+        state.string_array_value.data.extend(widget.options[i] for i in selected)
+    elif isinstance(selected, int):
+        state.int_value = selected
+    else:
+        state.int_array_value.data.extend(selected)
+    return state
+
+
+class Session:
+    def __init__(self, port, rng):
+        self.port = port
+        self.rng = rng
+        self.ws = None
+        self.session_id = ""
+        self.page_hash = ""
+        self.widgets = {}        # (element type, label) -> element proto
+        self.rendered = set()    # titles and labels drawn by the latest rerun
+        self.states = {}         # widget id -> WidgetState sent on every rerun
+        self.latencies = []
+        self.errors = 0
+        self._finished = None
+        self._file_urls = {}
+
+    async def connect(self):
+        # Deltas for big dataframes can exceed the default 1 MiB frame limit.
+        self.ws = await websockets.connect(f"ws://127.0.0.1:{self.port}/_stcore/stream", max_size=None)
+        self._reader = asyncio.ensure_future(self._read_loop())
+        await self.rerun()
+        self._expect_page("🏠 Home")
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+    async def _read_loop(self):
+        async for data in self.ws:
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                self.session_id = msg.new_session.initialize.session_id
+                self.page_hash = msg.new_session.page_script_hash
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                etype = element.WhichOneof("type")
+                widget = getattr(element, etype)
+                for attr in ("body", "label"):
+                    if isinstance(getattr(widget, attr, None), str):
+                        self.rendered.add(getattr(widget, attr))
+                if hasattr(widget, "id") and widget.id:
+                    self.widgets[(etype, getattr(widget, "label", ""))] = widget
+            elif kind == "script_finished":
+                if self._finished is not None and not self._finished.done():
+                    self._finished.set_result(msg.script_finished)
+            elif kind == "file_urls_response":
+                fut = self._file_urls.pop(msg.file_urls_response.response_id, None)
+                if fut is not None:
+                    fut.set_result(msg.file_urls_response.file_urls[0])
+
+    async def rerun(self, trigger=None, timeout=60):
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = self.page_hash
+        states = list(self.states.values()) + ([trigger] if trigger is not None else [])
+        msg.rerun_script.widget_states.widgets.extend(states)
+        self._finished = asyncio.get_running_loop().create_future()
+        self.rendered.clear()
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        try:
+            await asyncio.wait_for(self._finished, timeout)
+            self.latencies.append(time.perf_counter() - start)
+        except asyncio.TimeoutError:
+            self.errors += 1
+
+    def _find(self, etype, label=None):
+        for (t, l), widget in self.widgets.items():
+            if t == etype and (label is None or l == label):
+                return widget
+        return None
+
+    def _expect_page(self, page):
+        if PAGE_MARKERS[page] not in self.rendered:
+            raise ProtocolError(
+                f"{page!r} didn't render (no {PAGE_MARKERS[page]!r} in the rerun); "
+                "the widget state encoding probably doesn't match this Streamlit version"
+            )
+
+    async def goto(self, page):
+        radio = self._find("radio", "Go to")
+        if radio is None:
+            raise ProtocolError("navigation radio not found")
+        state = option_state(radio, list(radio.options).index(page))
+        if self.states.get(radio.id) != state:
+            self.states[radio.id] = state
+            n_latencies = len(self.latencies)
+            await self.rerun()
+            if len(self.latencies) > n_latencies:
+                self._expect_page(page)
+
+    async def change_filter(self):
+        await self.goto("📊 Analytics")
+        label = self.rng.choice(["🌍 Region", "📱 Platform"])
+        widget = self._find("multiselect", label)
+        if widget is None:
+            self.errors += 1
+            return
+        n = len(widget.options)
+        picked = sorted(self.rng.sample(range(n), self.rng.randint(1, n)))
+        self.states[widget.id] = option_state(widget, picked)
+        await self.rerun()
+
+    async def chat(self):
+        await self.goto("🤖 AI Chat")
+        widget = self._find("chat_input")
+        if widget is None:
+            self.errors += 1
+            return
+        trigger = WidgetState(id=widget.id)
+        trigger.string_trigger_value.data = self.rng.choice(CHAT_PROMPTS)
+        await self.rerun(trigger=trigger)
+
+    async def upload(self, rows=2000):
+        await self.goto("📁 File Tools")
+        widget = self._find("file_uploader", "Choose a CSV file")
+        if widget is None:
+            self.errors += 1
+            return
+        name = f"load_{uuid.uuid4().hex[:8]}.csv"
+        lines = ["a,b,c"] + [f"{self.rng.random():.6f},{self.rng.randint(0, 100)},x{self.rng.randint(0, 9)}" for _ in range(rows)]
+        body_bytes = "\n".join(lines).encode()
+
+        request_id = uuid.uuid4().hex
+        fut = asyncio.get_running_loop().create_future()
+        self._file_urls[request_id] = fut
+        msg = BackMsg()
+        msg.file_urls_request.request_id = request_id
+        msg.file_urls_request.session_id = self.session_id
+        msg.file_urls_request.file_names.append(name)
+        await self.ws.send(msg.SerializeToString())
+        urls = await asyncio.wait_for(fut, 30)
+
+        boundary = uuid.uuid4().hex
+        payload = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{name}\"\r\n"
+            "Content-Type: text/csv\r\n\r\n"
+        ).encode() + body_bytes + f"\r\n--{boundary}--\r\n".encode()
+        await asyncio.to_thread(
+            http, "PUT", f"http://127.0.0.1:{self.port}{urls.upload_url}", payload,
+            {"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
+
+        state = WidgetState(id=widget.id)
+        info = state.file_uploader_state_value.uploaded_file_info.add()
+        info.file_id = urls.file_id
+        info.name = name
+        info.size = len(body_bytes)
+        info.file_urls.CopyFrom(urls)
+        self.states[widget.id] = state
+        await self.rerun()
+
+    async def step(self, mix):
+        action = self.rng.choices(list(mix), weights=list(mix.values()))[0]
+        try:
+            if action == "page":
+                await self.goto(self.rng.choice(PAGES))
+            elif action == "filter":
+                await self.change_filter()
+            elif action == "upload":
+                await self.upload()
+            else:
+                await self.chat()
+        except ProtocolError:
+            raise
+        except Exception:
+            self.errors += 1
+
+
+# ─────────────────────────────────────────────
+# RUNNER
+# ─────────────────────────────────────────────
+async def warm_up(port):
+    # One throwaway session visits every page, so the app's imports, dataset
+    # and shared caches are in memory before the first RSS baseline; otherwise
+    # the first level's per-session figure absorbs them.
+    session = Session(port, random.Random(-1))
+    await session.connect()
+    try:
+        for page in PAGES[1:]:
+            await session.goto(page)
+    finally:
+        await session.close()
+
+
+async def run_level(port, pid, n_sessions, actions, mix, think_ms, seed):
+    sessions = [Session(port, random.Random(seed + i)) for i in range(n_sessions)]
+    peak = {"rss": rss_mb(pid)}
+    baseline = peak["rss"]
+
+    async def sample_rss():
+        while True:
+            peak["rss"] = max(peak["rss"], rss_mb(pid))
+            await asyncio.sleep(0.2)
+
+    async def drive(session):
+        await session.connect()
+        for _ in range(actions):
+            await session.step(mix)
+            if think_ms:
+                await asyncio.sleep(session.rng.uniform(0, 2 * think_ms) / 1000)
+
+    sampler = asyncio.ensure_future(sample_rss())
+    start = time.perf_counter()
+    results = await asyncio.gather(*(drive(s) for s in sessions), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    settled = rss_mb(pid)
+    sampler.cancel()
+    for s in sessions:
+        await s.close()
+    for result in results:
+        if isinstance(result, ProtocolError):
+            raise result
+
+    lat = np.array([x for s in sessions for x in s.latencies]) * 1000
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99]) if len(lat) else (np.nan,) * 3
+    return {
+        "sessions": n_sessions,
+        "reruns": len(lat),
+        "errors": sum(s.errors for s in sessions),
+        "throughput_rps": len(lat) / elapsed if elapsed else 0.0,
+        "p50_ms": p50, "p95_ms": p95, "p99_ms": p99,
+        "rss_start_mb": baseline,
+        "rss_peak_mb": peak["rss"],
+        "per_session_mb": (settled - baseline) / n_sessions,
+    }
+
+
+REPORT_COLUMNS = ["sessions", "reruns", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "rss_peak_mb", "per_session_mb"]
+
+
+def print_row(row):
+    print(" ".join(
+        f"{row[c]:>14.1f}" if isinstance(row[c], float) else f"{row[c]:>14}" for c in REPORT_COLUMNS
+    ), flush=True)
+
+
+async def main(args):
+    mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+    port = args.port or free_port()
+    proc = await start_server(port)
+    try:
+        await warm_up(port)
+        rows = []
+        print(" ".join(f"{c:>14}" for c in REPORT_COLUMNS))
+        for n in [int(x) for x in args.sessions.split(",")]:
+            rows.append(await run_level(port, proc.pid, n, args.actions, mix, args.think_ms, args.seed))
+            print_row(rows[-1])
+        if args.json:
+            with open(args.json, "w") as fh:
+                json.dump(rows, fh, indent=2, default=float)
+    finally:
+        proc.terminate()
+        proc.wait(10)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", default="1,5,10,25", help="comma-separated concurrency levels")
+    parser.add_argument("--actions", type=int, default=20, help="interactions per session")
+    parser.add_argument("--mix", help='JSON action weights, e.g. \'{"page": 1, "chat": 1}\'')
+    parser.add_argument("--think-ms", type=int, default=0, help="mean pause between actions")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write results to this file")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except ProtocolError as exc:
+        sys.exit(f"load test aborted: {exc}")
@@ -0,0 +1,257 @@
+import os
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Worker-side kernels live in this module (not app.py) because Streamlit
+# exec()s the app script, so functions defined there can't be pickled by
+# reference into a process pool.
+
+NUMERIC_COLUMNS = ["Revenue", "Users", "Sessions", "Bounce_Rate", "Conversion", "Satisfaction"]
+
+# Below this many rows the pool round-trip costs more than it saves.
+MIN_PARALLEL_ROWS = 200_000
+
+_attached = {}
+
+
+def _open_shm(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no `track`
+        return shared_memory.SharedMemory(name=name)
+
+
+def _attach(spec):
+    cols = {}
+    for col, (name, dtype, shape) in spec.items():
+        shm = _attached.get(name)
+        if shm is None:
+            shm = _attached[name] = _open_shm(name)
+        cols[col] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    return cols
+
+
+def _resolve(cols):
+    return _attach(cols) if isinstance(next(iter(cols.values())), tuple) else cols
+
+
+def _mask(cols, lo, hi, filt):
+    region_codes, platform_codes, day_lo, day_hi = filt
+    days = cols["Day"][lo:hi]
+    return (
+        np.isin(cols["Region_code"][lo:hi], region_codes)
+        & np.isin(cols["Platform_code"][lo:hi], platform_codes)
+        & (days >= day_lo)
+        & (days <= day_hi)
+    )
+
+
+# ── kernels (run in workers, or in-process for small frames) ──────────────
+
+def partial_group_sums(cols, lo, hi, filt, value_col, n_regions, n_months):
+    cols = _resolve(cols)
+    m = _mask(cols, lo, hi, filt)
+    keys = cols["Region_code"][lo:hi][m] * n_months + cols["Month_code"][lo:hi][m]
+    vals = cols[value_col][lo:hi][m].astype(np.float64)
+    size = n_regions * n_months
+    return np.bincount(keys, weights=vals, minlength=size), np.bincount(keys, minlength=size)
+
+
+def partial_day_sums(cols, lo, hi, filt, value_col, n_regions, n_days):
+    cols = _resolve(cols)
+    m = _mask(cols, lo, hi, filt)
+    keys = cols["Region_code"][lo:hi][m] * n_days + cols["Day"][lo:hi][m]
+    vals = cols[value_col][lo:hi][m].astype(np.float64)
+    size = n_regions * n_days
+    return np.bincount(keys, weights=vals, minlength=size), np.bincount(keys, minlength=size)
+
+
+def sorted_run(cols, lo, hi, filt, value_col):
+    # Sorts the selected values of rows [lo, hi) into Scratch[lo:lo + count];
+    # every task owns its own slice of the scratch column.
+    cols = _resolve(cols)
+    vals = np.sort(cols[value_col][lo:hi][_mask(cols, lo, hi, filt)].astype(np.float64))
+    cols["Scratch"][lo:lo + len(vals)] = vals
+    return len(vals)
+
+
+def _kth(runs, k):
+    # k-th smallest (0-based) across sorted runs: for each run, binary-search
+    # the first element with more than k values <= it; the minimum wins.
+    best = np.inf
+    for run in runs:
+        lo, hi = 0, len(run)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if sum(int(np.searchsorted(r, run[mid], side="right")) for r in runs) > k:
+                hi = mid
+            else:
+                lo = mid + 1
+        if lo < len(run):
+            best = min(best, run[lo])
+    return best
+
+
+def merged_quantiles(runs, qs):
+    # Matches np.quantile's default linear interpolation.
+    n = sum(len(r) for r in runs)
+    if not n:
+        return np.full(len(qs), np.nan)
+    out = []
+    for q in qs:
+        pos = q * (n - 1)
+        k = int(np.floor(pos))
+        lo = _kth(runs, k)
+        hi = _kth(runs, k + 1) if k + 1 < n else lo
+        out.append(lo + (pos - k) * (hi - lo))
+    return np.array(out)
+
+
+# ── engine ───────────────────────────────────────────────────────────────
+
+class SharedFrame:
+    # Columns copied once into shared memory; workers attach by block name.
+    def __init__(self, columns):
+        self._blocks = []
+        self.spec = {}
+        for col, arr in columns.items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+            self._blocks.append(shm)
+            self.spec[col] = (shm.name, arr.dtype.str, arr.shape)
+        atexit.register(self.close)
+
+    def close(self):
+        for shm in self._blocks:
+            try:
+                shm.close()
+                shm.unlink()
+            except (FileNotFoundError, BufferError):
+                pass
+        self._blocks = []
+
+
+class ParallelAggregator:
+    def __init__(self, frame, workers=None, min_parallel_rows=MIN_PARALLEL_ROWS):
+        self.workers = workers or os.cpu_count() or 1
+        self.n_rows = len(frame)
+        self.regions = sorted(frame["Region"].unique().tolist())
+        self.platforms = sorted(frame["Platform"].unique().tolist())
+        self.epoch = frame["Date"].min().normalize()
+        months = frame["Date"].dt.to_period("M")
+        self.months = sorted(months.unique())
+        columns = {col: frame[col].to_numpy() for col in NUMERIC_COLUMNS}
+        columns["Day"] = ((frame["Date"] - self.epoch).dt.days).to_numpy(np.int64)
+        columns["Region_code"] = pd.Categorical(frame["Region"], categories=self.regions).codes.astype(np.int64)
+        columns["Platform_code"] = pd.Categorical(frame["Platform"], categories=self.platforms).codes.astype(np.int64)
+        columns["Month_code"] = pd.Categorical(months, categories=self.months).codes.astype(np.int64)
+        self.n_days = int(columns["Day"].max()) + 1 if self.n_rows else 0
+        # Lay rows out region by region (time order kept within a region) so a
+        # region's rows are one contiguous range a task can scan on its own.
+        order = np.argsort(columns["Region_code"], kind="stable")
+        columns = {col: arr[order] for col, arr in columns.items()}
+        self.region_offsets = np.searchsorted(columns["Region_code"], np.arange(len(self.regions) + 1))
+        columns["Scratch"] = np.empty(self.n_rows, dtype=np.float64)
+        self._scratch_lock = threading.Lock()
+        self.parallel = self.workers > 1 and self.n_rows >= min_parallel_rows
+        if self.parallel:
+            self.shared = SharedFrame(columns)
+            self.cols = self.shared.spec
+            self.scratch = _attach({"Scratch": self.cols["Scratch"]})["Scratch"]
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+            atexit.register(self.pool.shutdown, wait=False, cancel_futures=True)
+        else:
+            self.cols = columns
+            self.scratch = columns["Scratch"]
+            self.pool = None
+
+    def make_filter(self, regions, platforms, date_range):
+        region_codes = np.array([self.regions.index(r) for r in regions if r in self.regions], dtype=np.int64)
+        platform_codes = np.array([self.platforms.index(p) for p in platforms if p in self.platforms], dtype=np.int64)
+        if len(date_range) == 2:
+            day_lo = (pd.Timestamp(date_range[0]) - self.epoch).days
+            day_hi = (pd.Timestamp(date_range[1]) - self.epoch).days
+        else:
+            day_lo, day_hi = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+        return region_codes, platform_codes, day_lo, day_hi
+
+    def _run(self, fn, arg_sets):
+        if self.pool is None:
+            return [fn(self.cols, *args) for args in arg_sets]
+        futures = [self.pool.submit(fn, self.cols, *args) for args in arg_sets]
+        return [f.result() for f in futures]
+
+    def _n_tasks(self):
+        return self.workers * 4
+
+    def _row_ranges(self):
+        bounds = np.linspace(0, self.n_rows, self._n_tasks() + 1, dtype=np.int64)
+        return [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+    def _region_ranges(self, filt):
+        # Split each selected region's contiguous rows into pieces of ~n / tasks rows.
+        step = max(1, -(-self.n_rows // self._n_tasks()))
+        ranges = []
+        for code in filt[0].tolist():
+            start, stop = int(self.region_offsets[code]), int(self.region_offsets[code + 1])
+            ranges.extend((code, lo, min(lo + step, stop)) for lo in range(start, stop, step))
+        return ranges
+
+    def cohort_retention(self, filt, value_col="Users"):
+        # Row-range partitions → per (region, month) partial sums → merged.
+        n_r, n_m = len(self.regions), len(self.months)
+        parts = self._run(partial_group_sums, [(lo, hi, filt, value_col, n_r, n_m) for lo, hi in self._row_ranges()])
+        sums = sum(p[0] for p in parts).reshape(n_r, n_m)
+        counts = sum(p[1] for p in parts).reshape(n_r, n_m)
+        table = pd.DataFrame(sums, index=self.regions, columns=[str(m) for m in self.months])
+        table = table.loc[counts.sum(axis=1) > 0, counts.sum(axis=0) > 0]
+        if table.empty:
+            return table
+        base = table.apply(lambda row: row[row > 0].iloc[0] if (row > 0).any() else np.nan, axis=1)
+        return table.div(base, axis=0)
+
+    def quantiles(self, filt, value_col, qs=(0.1, 0.25, 0.5, 0.75, 0.9)):
+        # Each task sorts a slice of one region into shared scratch; exact
+        # quantiles are then selected across the sorted runs.
+        ranges = self._region_ranges(filt)
+        with self._scratch_lock:
+            counts = self._run(sorted_run, [(lo, hi, filt, value_col) for _, lo, hi in ranges])
+            runs = {code: [] for code in filt[0].tolist()}
+            for (code, lo, _), count in zip(ranges, counts):
+                if count:
+                    runs[code].append(self.scratch[lo:lo + count])
+            table = {self.regions[code]: merged_quantiles(r, qs) for code, r in sorted(runs.items())}
+        return pd.DataFrame(table, index=[f"p{int(q * 100)}" for q in qs]).T
+
+    def rolling(self, filt, value_col, window):
+        # Row-range partials of per (region, day) sums and counts, merged onto a
+        # dense day axis; the window spans `window` calendar days.
+        n_r = len(self.regions)
+        parts = self._run(partial_day_sums, [(lo, hi, filt, value_col, n_r, self.n_days) for lo, hi in self._row_ranges()])
+        if not parts or not len(filt[0]):
+            return pd.DataFrame()
+        sums = sum(p[0] for p in parts).reshape(n_r, self.n_days)
+        counts = sum(p[1] for p in parts).reshape(n_r, self.n_days)
+        day_lo = max(int(filt[2]), 0)
+        day_hi = min(int(filt[3]), self.n_days - 1)
+        if day_lo > day_hi:
+            return pd.DataFrame()
+        codes = filt[0].tolist()
+        ps = np.zeros((len(codes), day_hi - day_lo + 2))
+        pc = np.zeros_like(ps)
+        np.cumsum(sums[codes, day_lo:day_hi + 1], axis=1, out=ps[:, 1:])
+        np.cumsum(counts[codes, day_lo:day_hi + 1], axis=1, out=pc[:, 1:])
+        roll = np.full((len(codes), day_hi - day_lo + 1), np.nan)
+        if ps.shape[1] - 1 >= window:
+            win_sum = ps[:, window:] - ps[:, :-window]
+            win_count = pc[:, window:] - pc[:, :-window]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                roll[:, window - 1:] = np.where(win_count > 0, win_sum / win_count, np.nan)
+        index = pd.DatetimeIndex(self.epoch + pd.to_timedelta(np.arange(day_lo, day_hi + 1), unit="D"), name="Date")
+        return pd.DataFrame(roll.T, index=index, columns=[self.regions[c] for c in codes])
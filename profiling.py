@@ -0,0 +1,182 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# One-pass, bounded-memory column profiling for CSV streams. Every sketch
+# keeps a fixed-size state no matter how many rows flow through it.
+
+
+def file_sha256(fh, block_size=1 << 20):
+    digest = hashlib.sha256()
+    fh.seek(0)
+    for block in iter(lambda: fh.read(block_size), b""):
+        digest.update(block)
+    fh.seek(0)
+    return digest.hexdigest()
+
+
+class HyperLogLog:
+    def __init__(self, p=12):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, series):
+        if series.empty:
+            return
+        h = pd.util.hash_pandas_object(series, index=False).to_numpy(np.uint64)
+        idx = (h >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = h & np.uint64((1 << (64 - self.p)) - 1)
+        # frexp's exponent is the bit length; exact because rest < 2**53.
+        _, bit_len = np.frexp(rest.astype(np.float64))
+        rho = (64 - self.p) - bit_len + 1
+        np.maximum.at(self.registers, idx, rho.astype(np.uint8))
+
+    def estimate(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * self.m and zeros:
+            return self.m * np.log(self.m / zeros)
+        return float(raw)
+
+
+class KLLSketch:
+    # Compactor levels of at most 2k items; an item at level h stands for 2**h values.
+    def __init__(self, k=256, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            buf = self.levels[h]
+            if len(buf) >= 2 * self.k:
+                buf = np.sort(buf)
+                keep = buf[:0]
+                if len(buf) % 2:
+                    keep, buf = buf[-1:], buf[:-1]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], buf[self.rng.integers(2)::2]])
+            h += 1
+
+    def weighted(self):
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(buf), 2.0 ** h) for h, buf in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def quantiles(self, qs):
+        values, weights = self.weighted()
+        if not len(values):
+            return [np.nan] * len(qs)
+        cum = np.cumsum(weights)
+        pos = np.searchsorted(cum, np.asarray(qs) * cum[-1], side="left")
+        return values[np.clip(pos, 0, len(values) - 1)].tolist()
+
+
+class TopK:
+    # Misra-Gries heavy hitters; counts are lower bounds off by at most n / capacity.
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.counts = {}
+
+    def update(self, series):
+        for value, count in series.dropna().value_counts().items():
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+        if len(self.counts) > self.capacity:
+            cut = sorted(self.counts.values(), reverse=True)[self.capacity]
+            self.counts = {v: c - cut for v, c in self.counts.items() if c > cut}
+
+    def top(self, k=5):
+        return sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:k]
+
+
+class ColumnProfile:
+    def __init__(self, numeric):
+        self.numeric = numeric
+        self.count = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog()
+        self.top = TopK()
+        self.quantiles = KLLSketch() if numeric else None
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, series):
+        self.count += len(series)
+        self.nulls += int(series.isna().sum())
+        present = series.dropna()
+        # A chunk with a null parses as float, one without as int, and 1 and
+        # 1.0 hash differently; hash numbers as float64 so chunks agree.
+        if pd.api.types.is_numeric_dtype(present) and not pd.api.types.is_bool_dtype(present):
+            self.distinct.update(present.astype(np.float64))
+        else:
+            self.distinct.update(present)
+        self.top.update(present)
+        if self.numeric:
+            values = pd.to_numeric(present, errors="coerce").to_numpy(np.float64)
+            values = values[~np.isnan(values)]
+            if len(values):
+                self.quantiles.update(values)
+                self.total += float(values.sum())
+                self.min = min(self.min, float(values.min()))
+                self.max = max(self.max, float(values.max()))
+
+    def histogram(self, bins=20):
+        if not self.numeric or self.min > self.max:
+            return None
+        values, weights = self.quantiles.weighted()
+        counts, edges = np.histogram(values, bins=bins, range=(self.min, self.max), weights=weights)
+        return pd.DataFrame({"bin": edges[:-1], "count": counts}).set_index("bin")
+
+    def summary(self, top_k=5):
+        row = {
+            "type": "numeric" if self.numeric else "text",
+            "nulls": self.nulls,
+            "null_%": 100 * self.nulls / self.count if self.count else 0.0,
+            "distinct≈": int(round(self.distinct.estimate())),
+            "top": ", ".join(f"{v} ({c})" for v, c in self.top.top(top_k)),
+        }
+        if self.numeric:
+            present = self.count - self.nulls
+            p05, p25, p50, p75, p95 = self.quantiles.quantiles([0.05, 0.25, 0.5, 0.75, 0.95])
+            row.update({
+                "mean": self.total / present if present else np.nan,
+                "min": self.min if present else np.nan,
+                "p05": p05, "p25": p25, "p50": p50, "p75": p75, "p95": p95,
+                "max": self.max if present else np.nan,
+            })
+        return row
+
+
+def profile_csv(source, chunksize=100_000, bins=20):
+    # `source` is a path or file object; only one chunk is in memory at a time.
+    columns = None
+    rows = 0
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        if columns is None:
+            columns = {
+                col: ColumnProfile(pd.api.types.is_numeric_dtype(chunk[col]))
+                for col in chunk.columns
+            }
+        for col, prof in columns.items():
+            prof.update(chunk[col])
+        rows += len(chunk)
+    columns = columns or {}
+    return {
+        "rows": rows,
+        "summary": pd.DataFrame({col: prof.summary() for col, prof in columns.items()}).T,
+        "histograms": {col: prof.histogram(bins) for col, prof in columns.items() if prof.numeric},
+    }
@@ -0,0 +1,111 @@
+import atexit
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+
+# Derived results (filtered frames, groupbys, chart frames) keyed by the
+# normalized filter tuple. Hot entries live in an in-memory LRU bounded by
+# bytes; entries pushed out of memory spill to a pickle file on disk.
+
+
+class ResultCache:
+    def __init__(self, max_bytes=64 * 1024**2, disk_max_bytes=512 * 1024**2, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        # Spill files are unpickled on load, so they must live in a directory
+        # only this process can write to: mkdtemp creates it 0700 with a random name.
+        self.disk_dir = disk_dir or tempfile.mkdtemp(prefix="megadash_cache_")
+        atexit.register(shutil.rmtree, self.disk_dir, ignore_errors=True)
+        self._mem = OrderedDict()
+        self._disk = OrderedDict()
+        self._mem_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+
+    @staticmethod
+    def _sizeof(value):
+        if isinstance(value, pa.Table):
+            return value.nbytes
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return int(value.memory_usage(deep=True).sum()) if isinstance(value, pd.DataFrame) else int(value.memory_usage(deep=True))
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(repr(key).encode()).hexdigest() + ".pkl")
+
+    def _put_mem(self, key, value, size):
+        self._mem[key] = (value, size)
+        self._mem_bytes += size
+        while self._mem_bytes > self.max_bytes and len(self._mem) > 1:
+            old_key, (old_value, old_size) = self._mem.popitem(last=False)
+            self._mem_bytes -= old_size
+            self.stats["evictions"] += 1
+            self._spill(old_key, old_value)
+
+    def _spill(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.disk_max_bytes:
+            return
+        with open(self._path(key), "wb") as fh:
+            fh.write(data)
+        self._disk[key] = len(data)
+        self._disk_bytes += len(data)
+        while self._disk_bytes > self.disk_max_bytes:
+            old_key, old_size = self._disk.popitem(last=False)
+            self._disk_bytes -= old_size
+            self.stats["disk_evictions"] += 1
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def _load_disk(self, key):
+        size = self._disk.pop(key)
+        self._disk_bytes -= size
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                value = pickle.load(fh)
+            os.remove(path)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None, False
+        return value, True
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._mem[key][0]
+            if key in self._disk:
+                value, ok = self._load_disk(key)
+                if ok:
+                    self.stats["disk_hits"] += 1
+                    self._put_mem(key, value, self._sizeof(value))
+                    return value
+            self.stats["misses"] += 1
+        # Compute outside the lock so one slow filter doesn't block other sessions.
+        value = compute()
+        size = self._sizeof(value)
+        with self._lock:
+            if key not in self._mem:
+                self._put_mem(key, value, size)
+        return value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                **self.stats,
+                "mem_entries": len(self._mem),
+                "mem_mb": round(self._mem_bytes / 1024**2, 2),
+                "disk_entries": len(self._disk),
+                "disk_mb": round(self._disk_bytes / 1024**2, 2),
+            }
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Per-day prefix sums and counts for every (Region, Platform) pair. Any
+# granularity and date window is then answered with two lookups per bucket
+# and selected pair instead of rescanning rows.
+
+GRANULARITIES = {"Day": "D", "Week": "W", "Month": "M", "Quarter": "Q", "Year": "Y"}
+
+# Additive metrics are summed per bucket; the rest (Revenue is a daily level,
+# rates are ratios) are averaged over the bucket's rows.
+SUM_METRICS = {"Users", "Sessions"}
+
+
+def aggregation_label(metric):
+    return "Total" if metric in SUM_METRICS else "Avg"
+
+
+def default_granularity(n_days):
+    if n_days <= 92:
+        return "Day"
+    if n_days <= 366:
+        return "Week"
+    if n_days <= 3 * 366:
+        return "Month"
+    return "Quarter"
+
+
+class TimeRollup:
+    def __init__(self, frame, metrics):
+        self.epoch = frame["Date"].min().normalize()
+        day = (frame["Date"].dt.normalize() - self.epoch).dt.days.to_numpy(np.int64)
+        self.n_days = int(day.max()) + 1
+        self.regions = sorted(frame["Region"].unique().tolist())
+        self.platforms = sorted(frame["Platform"].unique().tolist())
+        region = pd.Categorical(frame["Region"], categories=self.regions).codes.astype(np.int64)
+        platform = pd.Categorical(frame["Platform"], categories=self.platforms).codes.astype(np.int64)
+        n_pairs = len(self.regions) * len(self.platforms)
+        cell = (region * len(self.platforms) + platform) * self.n_days + day
+
+        def prefix(weights=None):
+            totals = np.bincount(cell, weights=weights, minlength=n_pairs * self.n_days)
+            out = np.zeros((n_pairs, self.n_days + 1))
+            np.cumsum(totals.reshape(n_pairs, self.n_days), axis=1, out=out[:, 1:])
+            return out
+
+        self.counts = prefix()
+        self.sums = {m: prefix(frame[m].to_numpy(np.float64)) for m in metrics}
+
+    def _pairs(self, regions, platforms):
+        n_p = len(self.platforms)
+        return np.array([
+            self.regions.index(r) * n_p + self.platforms.index(p)
+            for r in regions if r in self.regions
+            for p in platforms if p in self.platforms
+        ], dtype=np.int64)
+
+    def query(self, metric, regions, platforms, start, end, granularity):
+        start = max(pd.Timestamp(start), self.epoch)
+        end = min(pd.Timestamp(end), self.epoch + pd.Timedelta(days=self.n_days - 1))
+        pairs = self._pairs(regions, platforms)
+        if start > end or not len(pairs):
+            return pd.Series(dtype=np.float64, name=metric)
+        periods = pd.period_range(start, end, freq=GRANULARITIES[granularity])
+        lo = np.maximum((periods.start_time.normalize() - self.epoch).days.to_numpy(), (start - self.epoch).days)
+        hi = np.minimum((periods.end_time.normalize() - self.epoch).days.to_numpy(), (end - self.epoch).days) + 1
+        totals = (self.sums[metric][np.ix_(pairs, hi)] - self.sums[metric][np.ix_(pairs, lo)]).sum(axis=0)
+        counts = (self.counts[np.ix_(pairs, hi)] - self.counts[np.ix_(pairs, lo)]).sum(axis=0)
+        if metric not in SUM_METRICS:
+            totals = totals / np.maximum(counts, 1)
+        # Buckets the selection has no rows in are dropped rather than plotted
+        # as NaN or zero, so the chart stays one connected line.
+        keep = counts > 0
+        index = pd.DatetimeIndex(self.epoch + pd.to_timedelta(lo[keep], unit="D"), name="Date")
+        return pd.Series(totals[keep], index=index, name=metric)
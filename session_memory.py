@@ -0,0 +1,105 @@
+import reprlib
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Deep-size accounting for st.session_state, shared across sessions, plus
+# quota enforcement and cheap truncated previews for the state inspector.
+
+_preview = reprlib.Repr()
+_preview.maxstring = 80
+_preview.maxother = 80
+_preview.maxlist = _preview.maxtuple = _preview.maxdict = _preview.maxset = 4
+_preview.maxlevel = 2
+
+
+def preview(value):
+    return _preview.repr(value)
+
+
+def deep_sizeof(obj):
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, pd.DataFrame):
+            total += int(item.memory_usage(deep=True).sum())
+        elif isinstance(item, pd.Series):
+            total += int(item.memory_usage(deep=True))
+        elif isinstance(item, np.ndarray):
+            total += item.nbytes
+        else:
+            total += sys.getsizeof(item, 0)
+            if isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            elif isinstance(item, (list, tuple, set, frozenset)):
+                stack.extend(item)
+            elif hasattr(item, "__dict__"):
+                stack.append(vars(item))
+    return total
+
+
+def _fingerprint(value):
+    # In-place list appends change len(), so (id, len) catches the common growth paths.
+    try:
+        return id(value), len(value)
+    except TypeError:
+        return id(value), None
+
+
+class SessionMemoryRegistry:
+    def __init__(self, idle_seconds=3600):
+        self.idle_seconds = idle_seconds
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def account(self, session_id, items):
+        with self._lock:
+            entry = self._sessions.setdefault(session_id, {"keys": {}, "seen": 0.0})
+            old = entry["keys"]
+        sizes = {}
+        for key, value in items:
+            fp = _fingerprint(value)
+            cached = old.get(key)
+            sizes[key] = (fp, cached[1] if cached and cached[0] == fp else deep_sizeof(value))
+        with self._lock:
+            entry["keys"] = sizes
+            entry["seen"] = time.time()
+            self._prune()
+        return {key: size for key, (_, size) in sizes.items()}
+
+    def _prune(self):
+        cutoff = time.time() - self.idle_seconds
+        for sid in [sid for sid, e in self._sessions.items() if e["seen"] < cutoff]:
+            del self._sessions[sid]
+
+    def totals(self):
+        with self._lock:
+            return {sid: sum(size for _, size in e["keys"].values()) for sid, e in self._sessions.items()}
+
+
+def enforce_quota(state, sizes, quota_bytes, compactors, protected=()):
+    # Shrink the largest keys first: compact when a compactor exists, otherwise
+    # evict unless protected. Returns (new sizes, list of actions taken).
+    sizes = dict(sizes)
+    actions = []
+    for key in sorted(sizes, key=sizes.get, reverse=True):
+        if sum(sizes.values()) <= quota_bytes:
+            break
+        if key in compactors:
+            state[key] = compactors[key](state[key])
+            new_size = deep_sizeof(state[key])
+            actions.append(("compacted", key, sizes[key] - new_size))
+            sizes[key] = new_size
+        elif key not in protected:
+            del state[key]
+            actions.append(("evicted", key, sizes.pop(key)))
+    return sizes, actions
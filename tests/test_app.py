@@ -0,0 +1,115 @@
+import io
+import os
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.testing.v1 import AppTest
+
+from inference import InferenceService
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+@pytest.fixture
+def served(monkeypatch):
+    # AppTest tears its media storage down after each run, so record every
+    # file the app hands to it, keyed by the id that ends the button's URL.
+    files = {}
+    load = MemoryMediaFileStorage.load_and_get_id
+
+    def recording_load(self, data, *args, **kwargs):
+        file_id = load(self, data, *args, **kwargs)
+        files[file_id] = data
+        return file_id
+
+    monkeypatch.setattr(MemoryMediaFileStorage, "load_and_get_id", recording_load)
+    return files
+
+
+def parse_export(fmt, data):
+    if fmt == "CSV":
+        return pd.read_csv(io.BytesIO(data))
+    if fmt == "Parquet":
+        return pq.read_table(pa.BufferReader(data)).to_pandas()
+    return pa.ipc.open_file(pa.BufferReader(data)).read_all().to_pandas()
+
+
+@pytest.fixture
+def analytics(served):
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    at.sidebar.radio[0].set_value("📊 Analytics").run()
+    assert not at.exception
+    at.served = served
+    return at
+
+
+def prepare_export(at, fmt):
+    next(s for s in at.selectbox if s.label == "Format").set_value(fmt).run()
+    next(b for b in at.button if b.label == "📦 Prepare Export").click().run()
+    assert not at.exception, at.exception[0].message
+    (button,) = at.get("download_button")
+    file_id = os.path.splitext(os.path.basename(button.proto.url))[0]
+    return parse_export(fmt, at.served[file_id])
+
+
+@pytest.mark.parametrize("fmt", ["CSV", "Parquet", "Arrow IPC"])
+def test_export_downloads_the_filtered_rows(analytics, fmt):
+    exported = prepare_export(analytics, fmt)
+    assert len(exported) == 365
+    assert list(exported.columns) == ["Date", "Revenue", "Users", "Sessions", "Bounce_Rate",
+                                      "Conversion", "Region", "Platform", "Satisfaction"]
+
+
+@pytest.mark.parametrize("fmt", ["CSV", "Parquet", "Arrow IPC"])
+def test_export_of_an_empty_selection_is_a_valid_file(analytics, fmt):
+    next(m for m in analytics.multiselect if m.label == "🌍 Region").set_value([]).run()
+    exported = prepare_export(analytics, fmt)
+    assert len(exported) == 0
+    assert "Revenue" in exported.columns
+
+
+def test_export_button_is_gone_on_the_next_rerun(analytics):
+    prepare_export(analytics, "CSV")
+    analytics.run()
+    assert not analytics.get("download_button")
+
+
+@pytest.mark.parametrize("source", ["Revenue * 1" + "0" * 400, "+".join(["Revenue"] * 1500)])
+def test_bad_computed_metric_shows_an_error_and_keeps_the_input(analytics, source):
+    next(t for t in analytics.text_input if t.key == "computed_expr").input(source).run()
+    assert not analytics.exception
+    assert analytics.error
+    assert any(t.key == "computed_expr" for t in analytics.text_input)
+
+
+def test_score_selection_renders_scores(analytics):
+    next(b for b in analytics.button if b.label == "🎯 Score Filtered Rows").click().run()
+    assert not analytics.exception
+    assert any(m.label == "Rows Scored" and m.value == "365" for m in analytics.metric)
+
+
+class StuckFuture(Future):
+    # Times out at once instead of waiting on the shared worker.
+    def result(self, timeout=None):
+        raise FutureTimeoutError()
+
+
+def test_timed_out_scoring_request_is_cancelled(analytics, monkeypatch):
+    submitted = []
+
+    def submit(self, X):
+        submitted.append(StuckFuture())
+        return submitted[-1]
+
+    monkeypatch.setattr(InferenceService, "submit", submit)
+    # The result cache outlives AppTest runs; pick a selection nothing else scores.
+    next(m for m in analytics.multiselect if m.label == "📱 Platform").set_value(["Tablet"]).run()
+    next(b for b in analytics.button if b.label == "🎯 Score Filtered Rows").click().run()
+    assert not analytics.exception
+    assert analytics.error
+    assert len(submitted) == 1 and submitted[0].cancelled()
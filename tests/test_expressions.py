@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from expressions import CompiledExpression, ExpressionError
+
+COLUMNS = ["Revenue", "Users", "Sessions"]
+
+
+def frame(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Revenue": rng.normal(10_000, 500, n),
+        "Users": rng.integers(0, 1000, n),
+        "Sessions": rng.integers(0, 2000, n),
+    })
+
+
+def test_chunked_evaluation_matches_pandas():
+    df = frame()
+    expr = CompiledExpression("sqrt(Users) * Revenue / max(Sessions, 1) - 2", COLUMNS)
+    expected = np.sqrt(df["Users"]) * df["Revenue"] / np.maximum(df["Sessions"], 1) - 2
+    np.testing.assert_allclose(expr.evaluate(df, chunk_rows=97), expected)
+
+
+@pytest.mark.parametrize("source", ["Users / 0", "1 / 0", "Users"])
+def test_non_finite_results_are_nan_on_every_path(source):
+    df = pd.DataFrame({"Revenue": [1.0, 2.0], "Users": [np.inf, 0], "Sessions": [1, 1]})
+    out = CompiledExpression(source, COLUMNS).evaluate(df)
+    assert not np.isinf(out).any()
+
+
+@pytest.mark.parametrize("source", [
+    "Revenue * 1" + "0" * 400,             # int literal too large for a float
+    "+".join(["Revenue"] * 1500),          # long flat chain
+    "-" * 3000 + "Revenue",                # deep unary nesting
+    "(" * 300 + "Revenue" + ")" * 300,     # deep parentheses
+    "Revenue * 1" + "0" * 5000,            # past int-to-str digit limit
+    "Bounce",                              # unknown column
+    "Revenue.__class__",                   # attribute access
+    "Revenue +",                           # syntax error
+])
+def test_bad_input_raises_expression_error(source):
+    with pytest.raises(ExpressionError):
+        CompiledExpression(source, COLUMNS)
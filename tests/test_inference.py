@@ -0,0 +1,82 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from inference import FEATURES, InferenceService, MockModel
+
+
+def rows(n, seed=0):
+    return np.random.default_rng(seed).uniform(0, 1000, size=(n, len(FEATURES)))
+
+
+def test_mock_model_is_deterministic():
+    X = rows(50)
+    assert np.array_equal(MockModel().predict(X), MockModel().predict(X))
+
+
+def test_each_caller_gets_its_own_slice_of_the_batch():
+    model = MockModel()
+    service = InferenceService(model.predict, max_wait_ms=50)
+    requests = [rows(n, seed=n) for n in (1, 7, 3, 20)]
+    futures = [service.submit(X) for X in requests]
+    for X, future in zip(requests, futures):
+        assert np.allclose(future.result(timeout=5), model.predict(X))
+    assert service.metrics()["rows"] == sum(len(X) for X in requests)
+
+
+def test_batch_flushes_when_size_limit_is_reached():
+    # A long deadline means only the size limit can trigger the flush.
+    batches = []
+
+    def predict(X):
+        batches.append(len(X))
+        return MockModel().predict(X)
+
+    service = InferenceService(predict, max_batch_rows=10, max_wait_ms=60_000)
+    futures = [service.submit(rows(5, seed=i)) for i in range(2)]
+    for future in futures:
+        future.result(timeout=5)
+    assert batches == [10]
+
+
+def test_batch_flushes_on_deadline():
+    service = InferenceService(MockModel().predict, max_batch_rows=10_000, max_wait_ms=20)
+    start = time.monotonic()
+    service.submit(rows(3)).result(timeout=5)
+    assert time.monotonic() - start < 2
+    assert service.metrics()["batches"] == 1
+
+
+def test_predict_errors_reach_every_caller_and_worker_survives():
+    calls = []
+
+    def predict(X):
+        calls.append(len(X))
+        if len(calls) == 1:
+            raise RuntimeError("model crashed")
+        return np.zeros(len(X))
+
+    service = InferenceService(predict, max_wait_ms=50)
+    futures = [service.submit(rows(2, seed=i)) for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model crashed"):
+            future.result(timeout=5)
+    assert np.array_equal(service.submit(rows(4)).result(timeout=5), np.zeros(4))
+
+
+def test_cancelled_request_does_not_kill_the_worker():
+    release = threading.Event()
+
+    def predict(X):
+        release.wait(5)
+        return np.ones(len(X))
+
+    service = InferenceService(predict, max_batch_rows=1, max_wait_ms=1)
+    first = service.submit(rows(1))          # occupies the worker
+    cancelled = service.submit(rows(1))      # still queued, cancelled by its caller
+    assert cancelled.cancel()
+    release.set()
+    assert first.result(timeout=5).tolist() == [1.0]
+    assert service.submit(rows(2)).result(timeout=5).tolist() == [1.0, 1.0]
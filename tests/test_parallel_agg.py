@@ -0,0 +1,118 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from parallel_agg import ParallelAggregator, merged_quantiles
+
+QS = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def make_frame(rows=40_000, seed=0):
+    # Several rows per day, like a real event log, plus days with no rows.
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 365, rows)
+    days = days[(days < 100) | (days > 110)]
+    n = len(days)
+    return pd.DataFrame({
+        "Date": pd.Timestamp("2023-01-01") + pd.to_timedelta(np.sort(days), unit="D"),
+        "Revenue": rng.normal(10_000, 500, n),
+        "Users": rng.integers(100, 1000, n),
+        "Sessions": rng.integers(200, 2000, n),
+        "Bounce_Rate": rng.uniform(0.2, 0.8, n),
+        "Conversion": rng.uniform(0.01, 0.15, n),
+        "Region": rng.choice(["North", "South", "East", "West"], n),
+        "Platform": rng.choice(["Mobile", "Desktop", "Tablet"], n),
+        "Satisfaction": rng.choice([1, 2, 3, 4, 5], n),
+    })
+
+
+FRAME = make_frame()
+
+FILTERS = {
+    "everything": (["North", "South", "East", "West"], ["Mobile", "Desktop", "Tablet"], (date(2023, 1, 1), date(2023, 12, 31))),
+    "subset": (["West", "North"], ["Tablet"], (date(2023, 3, 15), date(2023, 8, 2))),
+    "no dates": (["East"], ["Mobile", "Desktop"], ()),
+}
+
+
+@pytest.fixture(scope="module", params=["in-process", "pool"])
+def aggregator(request):
+    if request.param == "pool":
+        agg = ParallelAggregator(FRAME, workers=2, min_parallel_rows=0)
+        assert agg.parallel
+    else:
+        agg = ParallelAggregator(FRAME, workers=1)
+        assert not agg.parallel
+    yield agg
+    if agg.pool is not None:
+        agg.pool.shutdown()
+        agg.shared.close()
+
+
+def select(regions, platforms, date_range):
+    mask = FRAME["Region"].isin(regions) & FRAME["Platform"].isin(platforms)
+    if date_range:
+        mask &= FRAME["Date"].between(pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]))
+    return FRAME[mask]
+
+
+@pytest.mark.parametrize("name", FILTERS)
+def test_quantiles_match_pandas(aggregator, name):
+    filt = aggregator.make_filter(*FILTERS[name])
+    got = aggregator.quantiles(filt, "Revenue", QS)
+    expected = select(*FILTERS[name]).groupby("Region")["Revenue"].quantile(list(QS)).unstack()
+    np.testing.assert_allclose(got.loc[expected.index].to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize("name", FILTERS)
+@pytest.mark.parametrize("window", [1, 7, 30])
+def test_rolling_mean_spans_calendar_days(aggregator, name, window):
+    regions, platforms, date_range = FILTERS[name]
+    got = aggregator.rolling(aggregator.make_filter(regions, platforms, date_range), "Users", window)
+    sel = select(regions, platforms, date_range)
+    if date_range:
+        days = pd.date_range(date_range[0], date_range[1], name="Date")
+    else:
+        days = pd.date_range(FRAME["Date"].min(), FRAME["Date"].max(), name="Date")
+    for region in regions:
+        daily = sel[sel["Region"] == region].groupby("Date")["Users"].agg(["sum", "count"]).reindex(days, fill_value=0)
+        win = daily.rolling(window).sum()
+        expected = (win["sum"] / win["count"]).where(win["count"] > 0)
+        pd.testing.assert_series_equal(got[region], expected, check_names=False, check_freq=False, check_index_type=False)
+
+
+@pytest.mark.parametrize("name", FILTERS)
+def test_cohort_retention_matches_pandas(aggregator, name):
+    got = aggregator.cohort_retention(aggregator.make_filter(*FILTERS[name]))
+    sel = select(*FILTERS[name])
+    table = sel.pivot_table(index="Region", columns=sel["Date"].dt.to_period("M"), values="Users",
+                            aggfunc="sum", fill_value=0).astype(float)
+    table.columns = table.columns.astype(str)
+    base = table.apply(lambda row: row[row > 0].iloc[0], axis=1)
+    pd.testing.assert_frame_equal(got, table.div(base, axis=0), check_names=False)
+
+
+def test_empty_selection_gives_empty_results(aggregator):
+    filt = aggregator.make_filter([], ["Mobile"], (date(2023, 1, 1), date(2023, 12, 31)))
+    assert aggregator.quantiles(filt, "Revenue", QS).empty
+    assert aggregator.rolling(filt, "Revenue", 7).empty
+    assert aggregator.cohort_retention(filt).empty
+    # A date range outside the data selects nothing either.
+    filt = aggregator.make_filter(["North"], ["Mobile"], (date(2030, 1, 1), date(2030, 2, 1)))
+    assert aggregator.rolling(filt, "Revenue", 7).empty
+    assert aggregator.cohort_retention(filt).empty
+
+
+@pytest.mark.parametrize("sizes", [[1], [5, 5], [0, 3, 10], [1, 1, 1, 1], [100, 7, 31, 2]])
+def test_merged_quantiles_match_numpy_over_the_concatenation(sizes):
+    # Ties across runs are the subtle case for the k-th element search.
+    rng = np.random.default_rng(len(sizes))
+    runs = [np.sort(rng.integers(0, 20, n).astype(float)) for n in sizes]
+    qs = np.linspace(0, 1, 11)
+    np.testing.assert_allclose(merged_quantiles(runs, qs), np.quantile(np.concatenate(runs), qs))
+
+
+def test_merged_quantiles_of_nothing_are_nan():
+    assert np.isnan(merged_quantiles([np.array([]), np.array([])], QS)).all()
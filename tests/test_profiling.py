@@ -0,0 +1,22 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from profiling import profile_csv
+
+
+def csv_bytes(frame):
+    return io.BytesIO(frame.to_csv(index=False).encode())
+
+
+def test_distinct_count_does_not_depend_on_how_chunks_parse():
+    # The second half has nulls, so its chunks parse as float64 while the
+    # first half's parse as int64; the same number must count once.
+    values = pd.Series(np.arange(5000) % 2500, dtype="Int64")
+    values[2500::50] = pd.NA
+    frame = pd.DataFrame({"x": values})
+    chunked = profile_csv(csv_bytes(frame), chunksize=2500)["summary"].loc["x", "distinct≈"]
+    whole = profile_csv(csv_bytes(frame), chunksize=10_000)["summary"].loc["x", "distinct≈"]
+    assert chunked == whole
+    assert abs(whole - 2500) / 2500 < 0.05
@@ -0,0 +1,84 @@
+import os
+
+import pandas as pd
+
+from result_cache import ResultCache
+
+KB = 1024
+
+
+def blob(tag, size=KB):
+    # Pickles to a little over `size` bytes.
+    return tag.encode() * size
+
+
+def not_computed():
+    raise AssertionError("value should have come from the cache")
+
+
+def fill(cache, keys):
+    for key in keys:
+        cache.get_or_compute(key, lambda key=key: blob(key))
+
+
+def test_hit_returns_cached_value_without_recomputing():
+    cache = ResultCache()
+    calls = []
+    for _ in range(3):
+        value = cache.get_or_compute("k", lambda: calls.append(1) or "v")
+    assert value == "v"
+    assert len(calls) == 1
+    assert cache.snapshot()["hits"] == 2
+    assert cache.snapshot()["misses"] == 1
+
+
+def test_memory_tier_is_bounded_by_bytes_and_evicts_least_recently_used():
+    cache = ResultCache(max_bytes=int(2.5 * KB))
+    fill(cache, ["a", "b"])
+    cache.get_or_compute("a", not_computed)  # "a" is now most recently used
+    fill(cache, ["c"])
+    snap = cache.snapshot()
+    assert snap["mem_entries"] == 2
+    assert snap["mem_mb"] * 1024**2 <= 2.5 * KB
+    assert snap["evictions"] == 1
+    assert "b" not in cache._mem and "b" in cache._disk
+
+
+def test_evicted_entry_spills_to_disk_and_reloads_without_recomputing():
+    cache = ResultCache(max_bytes=int(1.5 * KB))
+    fill(cache, ["a", "b"])
+    assert os.path.exists(cache._path("a"))
+    value = cache.get_or_compute("a", not_computed)
+    assert value == blob("a")
+    snap = cache.snapshot()
+    assert snap["disk_hits"] == 1
+    assert snap["misses"] == 2
+    # Reloading promotes "a" back into memory and removes its spill file,
+    # which pushes "b" out to disk in turn.
+    assert not os.path.exists(cache._path("a"))
+    assert os.path.exists(cache._path("b"))
+
+
+def test_disk_tier_is_bounded_and_drops_oldest_spill_files():
+    cache = ResultCache(max_bytes=int(1.5 * KB), disk_max_bytes=int(2.5 * KB))
+    fill(cache, ["a", "b", "c", "d"])  # "a", "b", "c" spill; "a" falls off disk
+    snap = cache.snapshot()
+    assert snap["evictions"] == 3
+    assert snap["disk_entries"] == 2
+    assert snap["disk_evictions"] == 1
+    assert not os.path.exists(cache._path("a"))
+    calls = []
+    cache.get_or_compute("a", lambda: calls.append(1) or blob("a"))
+    assert calls == [1]
+
+
+def test_disk_dir_is_private_to_the_process():
+    cache = ResultCache()
+    assert os.stat(cache.disk_dir).st_mode & 0o777 == 0o700
+    assert cache.disk_dir != ResultCache().disk_dir
+
+
+def test_frames_are_sized_by_their_memory_usage():
+    frame = pd.DataFrame({"x": range(1000), "y": ["s"] * 1000})
+    assert ResultCache._sizeof(frame) == int(frame.memory_usage(deep=True).sum())
+    assert ResultCache._sizeof(frame["x"]) == int(frame["x"].memory_usage(deep=True))
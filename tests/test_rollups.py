@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rollups import GRANULARITIES, TimeRollup
+
+METRICS = ["Revenue", "Users", "Bounce_Rate"]
+
+
+def make_frame(rows=500, seed=42):
+    # Mirrors the app's dataset: one row per day, random region and platform.
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=rows, freq="D"),
+        "Revenue": np.cumsum(rng.normal(50, 100, rows)) + 10_000,
+        "Users": rng.integers(100, 1000, rows),
+        "Bounce_Rate": rng.uniform(0.2, 0.8, rows),
+        "Region": rng.choice(["North", "South", "East", "West"], rows),
+        "Platform": rng.choice(["Mobile", "Desktop", "Tablet"], rows),
+    })
+
+
+FRAME = make_frame()
+ROLLUP = TimeRollup(FRAME, METRICS)
+
+
+@pytest.mark.parametrize("granularity", list(GRANULARITIES))
+@pytest.mark.parametrize("metric", METRICS)
+def test_query_matches_pandas_and_skips_empty_buckets(metric, granularity):
+    regions, platforms = ["North"], ["Mobile", "Tablet"]
+    start, end = pd.Timestamp("2023-02-10"), pd.Timestamp("2023-11-20")
+    got = ROLLUP.query(metric, regions, platforms, start, end, granularity)
+    sel = FRAME[FRAME["Region"].isin(regions) & FRAME["Platform"].isin(platforms) & FRAME["Date"].between(start, end)]
+    buckets = sel.groupby(sel["Date"].dt.to_period(GRANULARITIES[granularity]))[metric]
+    expected = buckets.sum() if metric == "Users" else buckets.mean()
+    assert not got.isna().any()
+    assert (got != 0).all()
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy())
+    # Each bucket is labelled by the first day of the bucket inside the window.
+    assert (got.index >= start).all()
+    assert list(got.index.to_period(GRANULARITIES[granularity])) == list(expected.index)
+
+
+def test_query_of_nothing_is_empty():
+    assert ROLLUP.query("Users", [], ["Mobile"], "2023-01-01", "2023-12-31", "Day").empty
+    assert ROLLUP.query("Users", ["North"], ["Mobile"], "2030-01-01", "2030-12-31", "Day").empty